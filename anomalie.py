@@ -0,0 +1,80 @@
+import math
+
+# ----------------------------------------------------------------------------
+# CONTROLLO ANOMALIE SUI RISULTATI
+# ----------------------------------------------------------------------------
+# Per ogni coppia (dipendente, KPI) si tengono media e varianza dei risultati in
+# modo incrementale (algoritmo di Welford): statistiche[(emp_id, kpi_name)] =
+# [numero, media, m2]. Ogni nuovo risultato costa O(1), anche su importazioni
+# di centinaia di migliaia di righe. Le statistiche di un'azienda sono tenute
+# dal suo archivio (dati.statistiche_risultati) e aggiornate a ogni salvataggio.
+
+SOGLIA_Z = 4.0          # scarti dalla media oltre cui un valore è anomalo
+MINIMO_CAMPIONI = 5     # sotto questo numero di risultati non si segnala nulla
+SCARTO_MINIMO = 0.1     # scarto minimo (frazione della media) per storici quasi costanti
+
+
+def aggiorna_statistiche(statistiche, chiave, valore):
+    stat = statistiche.get(chiave)
+    if stat is None:
+        stat = statistiche[chiave] = [0, 0.0, 0.0]
+    stat[0] += 1
+    delta = valore - stat[1]
+    stat[1] += delta / stat[0]
+    stat[2] += delta * (valore - stat[1])
+
+
+def costruisci_statistiche(dipendenti):
+    """
+    Statistiche di tutti gli storici risultati, con un solo passaggio sui dati.
+    'dipendenti' sono coppie (emp_id, emp), es. data["employees"].items() o le voci
+    lette a blocchi con dati.scorri_sezione.
+    """
+    statistiche = {}
+    for emp_id, emp in dipendenti:
+        for kpi_name, kpi_details in emp.get("kpis", {}).items():
+            for entry in kpi_details.get("storico_risultati", []):
+                aggiorna_statistiche(statistiche, (emp_id, kpi_name), entry["valore_raggiunto"])
+    return statistiche
+
+
+def verifica_risultato(statistiche, chiave, valore, soglia_z=SOGLIA_Z, minimo_campioni=MINIMO_CAMPIONI):
+    """
+    Restituisce un messaggio se 'valore' è anomalo rispetto allo storico di 'chiave', altrimenti None.
+    """
+    stat = statistiche.get(chiave)
+    if stat is None or stat[0] < minimo_campioni:
+        return None
+    numero, media, m2 = stat
+    scarto = max(math.sqrt(m2 / (numero - 1)), abs(media) * SCARTO_MINIMO)
+    if scarto == 0:
+        return None
+    z = (valore - media) / scarto
+    if abs(z) <= soglia_z:
+        return None
+    return (
+        f"Valore {valore} anomalo: la media dei {numero} risultati precedenti è {media:,.2f} "
+        f"(scarto {scarto:,.2f}, {z:+.1f} volte)."
+    )
+
+
+def verifica_importazione(statistiche, righe, soglia_z=SOGLIA_Z, minimo_campioni=MINIMO_CAMPIONI):
+    """
+    Controlla in ordine le righe (emp_id, kpi_name, data, valore) di un'importazione.
+    Le righe normali aggiornano una copia delle statistiche, così ogni riga è confrontata
+    anche con quelle importate prima di lei; le anomale no, per non falsare i controlli
+    successivi. 'statistiche' non viene modificato.
+    Restituisce la lista di (indice_riga, messaggio) delle righe anomale.
+    """
+    anomalie = []
+    locali = {}  # copie delle sole statistiche toccate dall'importazione
+    for indice, (emp_id, kpi_name, _, valore) in enumerate(righe):
+        chiave = (emp_id, kpi_name)
+        if chiave not in locali:
+            locali[chiave] = list(statistiche.get(chiave, [0, 0.0, 0.0]))
+        messaggio = verifica_risultato(locali, chiave, valore, soglia_z, minimo_campioni)
+        if messaggio is None:
+            aggiorna_statistiche(locali, chiave, valore)
+        else:
+            anomalie.append((indice, messaggio))
+    return anomalie
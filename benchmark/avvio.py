@@ -0,0 +1,121 @@
+"""
+Benchmark dei tempi di avvio (cold start) dell'app.
+
+Per ogni scenario avvia un nuovo interprete con `python -X importtime`, esegue gli
+import che l'app fa per mostrare quella pagina e somma i tempi cumulativi degli
+import di primo livello. Lo scenario "prima" riproduce gli import eseguiti in testa
+a incentivi-app2.py prima della suddivisione in pagine.
+
+Uso (dalla cartella del progetto):
+    python -m benchmark.avvio [--ripetizioni 5] [--json risultati_avvio.json]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+CARTELLA_PROGETTO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+MODULI_PESANTI = ["pandas", "matplotlib", "fpdf"]
+
+SCENARI = {
+    "prima: import in testa a incentivi-app2.py": (
+        "import streamlit, pandas, json, matplotlib.pyplot, fpdf, datetime"
+    ),
+    "dopo: Gestione Dipendenti": (
+        "import importlib, streamlit, dati, pagine.dipendenti"
+    ),
+    "dopo: Gestione KPI": (
+        "import importlib, streamlit, dati, pagine.kpi"
+    ),
+    "dopo: Inserimento Risultati (con storico)": (
+        "import importlib, streamlit, dati, pagine.risultati, pandas"
+    ),
+    "dopo: Report e Analisi": (
+        "import importlib, streamlit, dati, pagine.report, matplotlib.pyplot, PIL.Image"
+    ),
+    "dopo: Report e Analisi + PDF": (
+        "import importlib, streamlit, dati, pagine.report, matplotlib.pyplot, PIL.Image, fpdf"
+    ),
+    "dopo: Chiusura Mesi": (
+        "import importlib, streamlit, dati, pagine.chiusura_mesi"
+    ),
+    "dopo: Dashboard Avanzata": (
+        "import importlib, streamlit, dati, pagine.dashboard, pandas, matplotlib.pyplot"
+    ),
+}
+
+
+def misura_import(codice):
+    """
+    Esegue 'codice' in un interprete nuovo con -X importtime.
+    Restituisce (millisecondi di import, millisecondi totali del processo, moduli pesanti caricati).
+    """
+    inizio = time.perf_counter()
+    processo = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", codice],
+        cwd=CARTELLA_PROGETTO,
+        capture_output=True,
+        text=True
+    )
+    durata_processo = (time.perf_counter() - inizio) * 1000
+    if processo.returncode != 0:
+        raise RuntimeError(processo.stderr.strip().splitlines()[-1])
+
+    totale_us = 0
+    caricati = set()
+    for riga in processo.stderr.splitlines():
+        if not riga.startswith("import time:") or "imported package" in riga:
+            continue
+        _, cumulativo, nome = riga[len("import time:"):].split("|", 2)
+        nome = nome[1:]
+        # Solo gli import di primo livello (senza rientro), per non contare due volte
+        if not nome.startswith(" "):
+            totale_us += int(cumulativo)
+        radice = nome.strip().split(".")[0]
+        if radice in MODULI_PESANTI:
+            caricati.add(radice)
+    return totale_us / 1000, durata_processo, sorted(caricati)
+
+
+def esegui(ripetizioni):
+    risultati = {}
+    for nome, codice in SCENARI.items():
+        try:
+            misure = [misura_import(codice) for _ in range(ripetizioni)]
+        except RuntimeError as errore:
+            risultati[nome] = {"errore": str(errore)}
+            continue
+        risultati[nome] = {
+            "import_ms": round(statistics.median(m[0] for m in misure), 1),
+            "processo_ms": round(statistics.median(m[1] for m in misure), 1),
+            "moduli_pesanti": misure[0][2]
+        }
+    return risultati
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Tempi di avvio dell'app per pagina")
+    parser.add_argument("--ripetizioni", type=int, default=5, help="avvii per scenario (si riporta la mediana)")
+    parser.add_argument("--json", help="salva i risultati in questo file per confrontarli nel tempo")
+    args = parser.parse_args(argv)
+
+    risultati = esegui(args.ripetizioni)
+    for nome, r in risultati.items():
+        if "errore" in r:
+            print(f"{nome:<45} errore: {r['errore']}")
+        else:
+            pesanti = ", ".join(r["moduli_pesanti"]) or "-"
+            print(f"{nome:<45} import {r['import_ms']:>8.1f} ms   processo {r['processo_ms']:>8.1f} ms   pesanti: {pesanti}")
+
+    if args.json:
+        with open(args.json, "w") as file:
+            json.dump({"python": sys.version.split()[0], "ripetizioni": args.ripetizioni, "scenari": risultati}, file, indent=4)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,612 @@
+"""
+Test di carico: N sessioni HR simultanee contro un solo server Streamlit reale.
+
+Avvia `streamlit run incentivi-app2.py` (headless) su dati sintetici creati in una
+cartella temporanea e lo usa con N client websocket senza browser, tutti nello
+stesso processo. Ogni client parla il protocollo del frontend di Streamlit: chiede
+le esecuzioni dello script (BackMsg.rerun_script) con lo stato dei widget, riceve
+gli elementi della pagina (ForwardMsg), scarica immagini e PDF come farebbe il
+browser e imposta i widget per etichetta. Le sessioni ripetono i flussi tipici
+(consultazione dashboard, inserimento risultati, generazione PDF).
+
+Per ogni numero di sessioni (es. --sessioni 1,5,10,20, un server nuovo per ogni
+livello) riporta per ogni passo latenza p50/p90/p99/max, il throughput complessivo,
+la CPU usata dal server e la memoria del server: RSS dopo una sessione di
+riscaldamento, RSS con le N sessioni ancora connesse a fine prova, aumento per
+sessione in più e picco (VmHWM). La memoria è letta da /proc (Linux).
+La CPU del client è riportata per verificare che il collo di bottiglia non sia
+il client stesso.
+
+Uso (dalla cartella del progetto):
+    python -m benchmark.carico [--sessioni 1,5,10] [--iterazioni 3] [--dipendenti 300] [--aziende 1]
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+from datetime import date
+
+CARTELLA_PROGETTO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP = os.path.join(CARTELLA_PROGETTO, "incentivi-app2.py")
+
+RUOLI = ["Vendite", "Marketing", "Amministrazione", "Magazzino", "Call center", "Direzione"]
+TIPI_KPI = ["Importo fisso", "% sul risultato", "% sul salario mensile", "Importo fisso x risultato"]
+OBIETTIVI_PPF = ["Aprire 3 nuovi clienti nel trimestre", "Ridurre i resi del 10%", "Certificazione interna entro fine anno"]
+
+TIMEOUT_PASSO = 300  # secondi oltre cui un passo è considerato fallito
+RADICE_MAIN, RADICE_SIDEBAR = 0, 1  # primo elemento di delta_path
+
+
+# ----------------------------------------------------------------------------
+# DATI SINTETICI
+# ----------------------------------------------------------------------------
+
+def genera_ppf(rng):
+    """
+    PPF come li lascia l'app: vuoto (il default della pagina Dipendenti), testo libero
+    o un importo mensile.
+    """
+    caso = rng.random()
+    if caso < 0.4:
+        return ""
+    if caso < 0.6:
+        return rng.choice(OBIETTIVI_PPF)
+    return str(rng.randint(20, 70) * 100)
+
+
+def genera_dati(dipendenti, kpi_per_dipendente, mesi, seed):
+    """
+    Anagrafica con ruoli, PPF realistici, KPI di tutti i tipi (alcuni a scaglioni) e
+    un risultato al mese per KPI negli ultimi 'mesi' mesi.
+    """
+    rng = random.Random(seed)
+    oggi = date.today()
+    elenco_mesi = []
+    anno, mese = oggi.year, oggi.month
+    for _ in range(mesi):
+        elenco_mesi.append((anno, mese))
+        anno, mese = (anno - 1, 12) if mese == 1 else (anno, mese - 1)
+
+    employees = {}
+    for i in range(1, dipendenti + 1):
+        kpis = {}
+        for k in range(kpi_per_dipendente):
+            base = rng.randint(10, 500)
+            scaglioni = []
+            if rng.random() < 0.3:
+                scaglioni = [[base * 0.5, 50.0, 1.0], [base, 150.0, 2.0], [base * 1.5, 300.0, 3.0]]
+            kpis[f"KPI {k + 1}"] = {
+                "incentive_type": rng.choice(TIPI_KPI),
+                "risultato_minimo": float(base // 2),
+                "premio": float(rng.randint(1, 20)),
+                "scaglioni": scaglioni,
+                "storico_risultati": [
+                    {"data": f"{a}-{m:02d}-{rng.randint(1, 28):02d}", "valore_raggiunto": float(rng.randint(base // 2, base * 2))}
+                    for a, m in reversed(elenco_mesi)
+                ]
+            }
+        employees[str(i)] = {
+            "name": f"Dipendente {i}",
+            "salario_mensile": float(rng.randint(16, 50) * 100),
+            "ruolo": rng.choice(RUOLI),
+            "ppf": genera_ppf(rng),
+            "kpis": kpis
+        }
+    return {"employees": employees}
+
+
+def prepara_archivi(aziende, dati):
+    """
+    Scrive lo stesso dataset per ogni azienda nella cartella corrente; restituisce i nomi delle aziende.
+    """
+    from dati import AZIENDA_PREDEFINITA, save_data
+
+    nomi = [AZIENDA_PREDEFINITA] + [f"Azienda {n}" for n in range(2, aziende + 1)]
+    for nome in nomi:
+        save_data(json.loads(json.dumps(dati)), nome)
+    return nomi
+
+
+# ----------------------------------------------------------------------------
+# SERVER
+# ----------------------------------------------------------------------------
+
+def _porta_libera():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def avvia_server(cartella_lavoro, porta, timeout=60):
+    """
+    Avvia `streamlit run` sull'app nella cartella dei dati e attende che risponda.
+    """
+    server = subprocess.Popen(
+        [
+            sys.executable, "-m", "streamlit", "run", APP,
+            "--server.headless", "true",
+            "--server.address", "127.0.0.1",
+            "--server.port", str(porta),
+            "--server.fileWatcherType", "none",
+            "--browser.gatherUsageStats", "false"
+        ],
+        cwd=cartella_lavoro,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL
+    )
+    scadenza = time.monotonic() + timeout
+    while time.monotonic() < scadenza:
+        if server.poll() is not None:
+            raise RuntimeError(f"Il server Streamlit è terminato all'avvio (codice {server.returncode})")
+        try:
+            with urllib.request.urlopen(f"http://127.0.0.1:{porta}/_stcore/health", timeout=2) as risposta:
+                if risposta.status == 200:
+                    return server
+        except OSError:
+            time.sleep(0.2)
+    server.kill()
+    raise RuntimeError("Il server Streamlit non risponde")
+
+
+def ferma_server(server):
+    server.terminate()
+    try:
+        server.wait(timeout=10)
+    except subprocess.TimeoutExpired:
+        server.kill()
+        server.wait()
+
+
+def memoria_server(pid):
+    """
+    (RSS attuale, picco RSS) del processo in MB, da /proc/<pid>/status.
+    """
+    valori = {}
+    with open(f"/proc/{pid}/status") as file:
+        for riga in file:
+            nome, _, valore = riga.partition(":")
+            if nome in ("VmRSS", "VmHWM"):
+                valori[nome] = int(valore.split()[0]) / 1024
+    return valori["VmRSS"], valori["VmHWM"]
+
+
+def cpu_server(pid):
+    """
+    Secondi di CPU (utente + sistema) usati finora dal processo, da /proc/<pid>/stat.
+    """
+    with open(f"/proc/{pid}/stat") as file:
+        campi = file.read().rsplit(")", 1)[1].split()
+    return (int(campi[11]) + int(campi[12])) / os.sysconf("SC_CLK_TCK")
+
+
+# ----------------------------------------------------------------------------
+# CLIENT WEBSOCKET
+# ----------------------------------------------------------------------------
+
+class SessioneRemota:
+    """
+    Una sessione del browser senza browser: una connessione websocket al server.
+
+    Come il frontend, a ogni esecuzione manda i valori di tutti i widget impostati
+    (quelli non più presenti nella pagina vengono dimenticati, i bottoni valgono per
+    una sola esecuzione), tiene da parte i messaggi che il server potrebbe rimandare
+    come riferimento (ref_hash) e scarica immagini e file da scaricare.
+    """
+
+    ETA_MASSIMA_CACHE = 4  # esecuzioni dopo cui un messaggio non può più essere riferito
+
+    def __init__(self, porta):
+        self.porta = porta
+        self.ws = None
+        self.elementi = {}   # delta_path -> (tipo, proto) dell'esecuzione corrente
+        self.valori = {}     # id widget -> WidgetState impostato dall'utente
+        self.cache = {}      # hash -> (esecuzione, ForwardMsg)
+        self.esecuzioni = 0
+        self.errori = []
+
+    async def connetti(self):
+        from tornado.websocket import websocket_connect
+
+        self.ws = await websocket_connect(
+            f"ws://127.0.0.1:{self.porta}/_stcore/stream",
+            max_message_size=200 * 1024 * 1024
+        )
+
+    def chiudi(self):
+        if self.ws is not None:
+            self.ws.close()
+            self.ws = None
+
+    async def _ricevi(self):
+        from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+
+        dati = await self.ws.read_message()
+        if dati is None:
+            raise RuntimeError("Connessione chiusa dal server")
+        msg = ForwardMsg()
+        msg.ParseFromString(dati)
+        if msg.WhichOneof("type") == "ref_hash":
+            voce = self.cache.get(msg.ref_hash)
+            if voce is None:
+                raise RuntimeError(f"Messaggio in cache sconosciuto: {msg.ref_hash}")
+            originale = ForwardMsg()
+            originale.CopyFrom(voce[1])
+            originale.metadata.CopyFrom(msg.metadata)
+            msg = originale
+        if msg.metadata.cacheable:
+            self.cache[msg.hash] = (self.esecuzioni, msg)
+        return msg
+
+    async def esegui(self):
+        """
+        Chiede un'esecuzione dello script e attende la fine, comprese le riesecuzioni
+        chieste dallo script (st.experimental_rerun); poi scarica le immagini della pagina.
+        """
+        from streamlit.proto.BackMsg_pb2 import BackMsg
+        from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+
+        richiesta = BackMsg()
+        richiesta.rerun_script.query_string = ""
+        richiesta.rerun_script.page_script_hash = ""
+        for stato in self.valori.values():
+            richiesta.rerun_script.widget_states.widgets.append(stato)
+        # I bottoni valgono una sola esecuzione
+        self.valori = {wid: stato for wid, stato in self.valori.items() if stato.WhichOneof("value") != "trigger_value"}
+        await self.ws.write_message(richiesta.SerializeToString(), binary=True)
+
+        self.errori = []
+        while True:
+            msg = await self._ricevi()
+            tipo = msg.WhichOneof("type")
+            if tipo == "new_session":
+                self.elementi = {}
+            elif tipo == "delta" and msg.delta.WhichOneof("type") == "new_element":
+                elemento = msg.delta.new_element
+                tipo_elemento = elemento.WhichOneof("type")
+                self.elementi[tuple(msg.metadata.delta_path)] = (tipo_elemento, getattr(elemento, tipo_elemento))
+                if tipo_elemento == "exception":
+                    self.errori.append(f"{elemento.exception.type}: {elemento.exception.message}")
+            elif tipo == "script_finished" and msg.script_finished != ForwardMsg.FINISHED_EARLY_FOR_RERUN:
+                if msg.script_finished == ForwardMsg.FINISHED_WITH_COMPILE_ERROR:
+                    self.errori.append("Errore di compilazione dello script")
+                break
+
+        self.esecuzioni += 1
+        self.cache = {h: voce for h, voce in self.cache.items() if self.esecuzioni - voce[0] <= self.ETA_MASSIMA_CACHE}
+        presenti = {getattr(proto, "id", None) for _, proto in self.elementi.values()}
+        self.valori = {wid: stato for wid, stato in self.valori.items() if wid in presenti}
+
+        for tipo_elemento, proto in list(self.elementi.values()):
+            if tipo_elemento == "imgs":
+                for immagine in proto.imgs:
+                    await self.scarica(immagine.url)
+        if self.errori:
+            raise RuntimeError(self.errori[0])
+
+    async def scarica(self, url):
+        from tornado.httpclient import AsyncHTTPClient
+
+        if url.startswith("/"):
+            url = f"http://127.0.0.1:{self.porta}{url}"
+        await AsyncHTTPClient().fetch(url)
+
+    def widget(self, tipo, etichetta, radice=RADICE_MAIN):
+        for percorso, (tipo_elemento, proto) in sorted(self.elementi.items()):
+            if tipo_elemento == tipo and percorso[0] == radice and proto.label == etichetta:
+                return proto
+        # Con gli avvisi della pagina, che di solito spiegano perché il widget manca
+        avvisi = [proto.body for tipo_elemento, proto in self.elementi.values() if tipo_elemento == "alert"]
+        raise RuntimeError(f"Widget {tipo} '{etichetta}' non trovato; avvisi: {avvisi}")
+
+    def opzioni(self, tipo, etichetta, radice=RADICE_MAIN):
+        return list(self.widget(tipo, etichetta, radice).options)
+
+    def imposta(self, tipo, etichetta, valore, radice=RADICE_MAIN):
+        """
+        Imposta un widget come farebbe l'utente. 'valore' è l'opzione (selectbox, radio),
+        la lista di opzioni (multiselect), un date, un numero o un bool.
+        """
+        from streamlit.proto.WidgetStates_pb2 import WidgetState
+
+        proto = self.widget(tipo, etichetta, radice)
+        stato = WidgetState(id=proto.id)
+        if tipo in ("selectbox", "radio"):
+            stato.int_value = list(proto.options).index(valore)
+        elif tipo == "multiselect":
+            stato.int_array_value.data.extend(list(proto.options).index(v) for v in valore)
+        elif tipo == "date_input":
+            stato.string_array_value.data.append(valore.strftime("%Y/%m/%d"))
+        elif tipo == "number_input":
+            stato.double_value = valore
+        elif tipo == "checkbox":
+            stato.bool_value = valore
+        elif tipo == "button":
+            stato.trigger_value = True
+        else:
+            raise ValueError(f"Tipo di widget non gestito: {tipo}")
+        self.valori[proto.id] = stato
+
+    def clicca(self, etichetta):
+        self.imposta("button", etichetta, True)
+
+    def presente(self, tipo, etichetta):
+        return any(t == tipo and getattr(p, "label", None) == etichetta for t, p in self.elementi.values())
+
+    async def vai(self, pagina):
+        self.imposta("radio", "Vai a", pagina, RADICE_SIDEBAR)
+        await self.esegui()
+
+
+# ----------------------------------------------------------------------------
+# FLUSSI DI UNA SESSIONE
+# ----------------------------------------------------------------------------
+
+async def flusso_dashboard(s, rng, misura):
+    await misura("dashboard: apertura", lambda: s.vai("Dashboard Avanzata"))
+    ruolo = rng.choice(s.opzioni("multiselect", "🏷️ Filtra per ruolo"))
+
+    async def filtra():
+        # Con un ruolo scelto la dashboard passa da sola alla vista per ruolo
+        s.imposta("multiselect", "🏷️ Filtra per ruolo", [ruolo])
+        await s.esegui()
+
+    async def per_dipendente():
+        s.imposta("radio", "📂 Vista", "Per dipendente")
+        await s.esegui()
+
+    await misura("dashboard: filtro per ruolo", filtra)
+    await misura("dashboard: vista per dipendente", per_dipendente)
+
+
+async def flusso_risultati(s, rng, misura):
+    await misura("risultati: apertura", lambda: s.vai("Inserimento Risultati"))
+
+    async def seleziona():
+        dipendenti = s.opzioni("selectbox", "👤 Seleziona Dipendente")
+        s.imposta("selectbox", "👤 Seleziona Dipendente", rng.choice(dipendenti))
+        await s.esegui()
+
+    async def salva():
+        # Date future casuali: nessun conflitto con lo storico o con i mesi chiusi
+        s.imposta("date_input", "📆 Data", date(date.today().year + rng.randint(1, 5), rng.randint(1, 12), rng.randint(1, 28)))
+        s.imposta("number_input", "📊 Risultato ottenuto", float(rng.randint(50, 300)))
+        await s.esegui()
+        if s.presente("checkbox", "Confermo che il valore è corretto"):
+            s.imposta("checkbox", "Confermo che il valore è corretto", True)
+        s.clicca("✅ Salva Risultato")
+        await s.esegui()
+
+    await misura("risultati: selezione dipendente", seleziona)
+    await misura("risultati: salvataggio", salva)
+
+
+async def flusso_pdf(s, rng, misura):
+    await misura("pdf: apertura report", lambda: s.vai("Report e Analisi"))
+
+    async def seleziona():
+        dipendenti = s.opzioni("selectbox", "👤 Seleziona Dipendente")
+        s.imposta("selectbox", "👤 Seleziona Dipendente", rng.choice(dipendenti))
+        await s.esegui()
+
+    async def genera():
+        mesi = s.opzioni("selectbox", "Scegli il mese per generare il PDF")
+        s.imposta("selectbox", "Scegli il mese per generare il PDF", rng.choice(mesi))
+        s.clicca("Genera Riepilogo Mensile PDF")
+        await s.esegui()
+        # Il download del PDF, come il clic sul bottone nel browser
+        await s.scarica(s.widget("download_button", "📥 Scarica PDF del Riepilogo Mensile").url)
+
+    await misura("pdf: selezione dipendente", seleziona)
+    await misura("pdf: generazione e download", genera)
+
+
+FLUSSI = [flusso_dashboard, flusso_risultati, flusso_pdf]
+
+
+async def apri_sessione(porta, azienda, misura):
+    from dati import AZIENDA_PREDEFINITA
+
+    s = SessioneRemota(porta)
+
+    async def avvio():
+        await s.connetti()
+        await s.esegui()
+
+    async def scegli_azienda():
+        s.imposta("selectbox", "🏢 Azienda", azienda, RADICE_SIDEBAR)
+        await s.esegui()
+
+    await misura("avvio sessione", avvio)
+    if azienda != AZIENDA_PREDEFINITA:
+        await misura("selezione azienda", scegli_azienda)
+    return s
+
+
+async def sessione(numero, porta, azienda, iterazioni, seed, misure):
+    """
+    Una sessione: apre l'app, sceglie l'azienda e ripete i flussi. Restituisce la
+    sessione ancora connessa, così la memoria del server si misura con tutte le
+    sessioni aperte.
+    """
+    rng = random.Random(seed + numero)
+
+    async def misura(passo, azione):
+        inizio = time.perf_counter()
+        errore = None
+        try:
+            await asyncio.wait_for(azione(), TIMEOUT_PASSO)
+        except Exception as e:
+            errore = f"{type(e).__name__}: {e}"
+        misure.append((passo, time.perf_counter() - inizio, errore))
+
+    s = await apri_sessione(porta, azienda, misura)
+    if s.ws is not None:
+        for _ in range(iterazioni):
+            for flusso in FLUSSI:
+                await flusso(s, rng, misura)
+    return s
+
+
+async def prova(porta, pid, aziende, sessioni, iterazioni, seed):
+    """
+    Una sessione di riscaldamento (import, cache dei dati derivati), poi 'sessioni'
+    sessioni simultanee. Restituisce (misure, durata, memoria, cpu del server).
+    """
+    from tornado.httpclient import AsyncHTTPClient
+
+    AsyncHTTPClient.configure(None, max_clients=max(10, sessioni * 2))
+
+    # Numero di sessione non usato dalla prova: con lo stesso seed farebbe le stesse scelte
+    # (random.Random(-1) equivale a Random(1)) e salverebbe risultati nelle stesse date
+    riscaldamento = await sessione(sessioni, porta, aziende[0], 1, seed, [])
+    rss_base, _ = memoria_server(pid)
+
+    misure = []
+    cpu_inizio = cpu_server(pid)
+    inizio = time.monotonic()
+    aperte = await asyncio.gather(*[
+        sessione(n, porta, aziende[n % len(aziende)], iterazioni, seed, misure)
+        for n in range(sessioni)
+    ])
+    durata = time.monotonic() - inizio
+    cpu = cpu_server(pid) - cpu_inizio
+    rss_finale, rss_picco = memoria_server(pid)
+
+    for s in aperte + [riscaldamento]:
+        s.chiudi()
+    memoria = {"base": rss_base, "finale": rss_finale, "picco": rss_picco}
+    return misure, durata, memoria, cpu
+
+
+# ----------------------------------------------------------------------------
+# REPORT
+# ----------------------------------------------------------------------------
+
+def percentile(valori_ordinati, p):
+    indice = min(len(valori_ordinati) - 1, max(0, round(p / 100 * len(valori_ordinati)) - 1))
+    return valori_ordinati[indice]
+
+
+def riepilogo(misure, durata, sessioni, memoria, cpu_server_s, cpu_client_s):
+    passi = {}
+    for passo, secondi, errore in misure:
+        voce = passi.setdefault(passo, {"tempi": [], "errori": 0, "ultimo_errore": None})
+        voce["tempi"].append(secondi * 1000)
+        if errore:
+            voce["errori"] += 1
+            voce["ultimo_errore"] = errore
+
+    tutti = sorted(secondi * 1000 for _, secondi, _ in misure)
+    risultato = {
+        "passi": {},
+        "durata_s": round(durata, 2),
+        "sessioni": sessioni,
+        "p50_ms": round(percentile(tutti, 50), 1),
+        "p90_ms": round(percentile(tutti, 90), 1)
+    }
+    for passo, voce in passi.items():
+        tempi = sorted(voce["tempi"])
+        risultato["passi"][passo] = {
+            "numero": len(tempi),
+            "errori": voce["errori"],
+            "ultimo_errore": voce["ultimo_errore"],
+            "p50_ms": round(percentile(tempi, 50), 1),
+            "p90_ms": round(percentile(tempi, 90), 1),
+            "p99_ms": round(percentile(tempi, 99), 1),
+            "max_ms": round(tempi[-1], 1)
+        }
+    risultato["throughput_passi_s"] = round(len(misure) / durata, 2) if durata else 0
+    risultato["rss_base_mb"] = round(memoria["base"], 1)
+    risultato["rss_finale_mb"] = round(memoria["finale"], 1)
+    risultato["rss_per_sessione_mb"] = round((memoria["finale"] - memoria["base"]) / sessioni, 2)
+    risultato["rss_picco_mb"] = round(memoria["picco"], 1)
+    risultato["cpu_server_percento"] = round(cpu_server_s / durata * 100, 1) if durata else 0
+    risultato["cpu_client_percento"] = round(cpu_client_s / durata * 100, 1) if durata else 0
+    return risultato
+
+
+def stampa(risultato):
+    print(f"\n=== {risultato['sessioni']} sessioni simultanee ===")
+    print(f"{'Passo':<34} {'n':>5} {'err':>4} {'p50 ms':>9} {'p90 ms':>9} {'p99 ms':>9} {'max ms':>9}")
+    for passo, r in risultato["passi"].items():
+        print(f"{passo:<34} {r['numero']:>5} {r['errori']:>4} {r['p50_ms']:>9.1f} {r['p90_ms']:>9.1f} {r['p99_ms']:>9.1f} {r['max_ms']:>9.1f}")
+    print(f"durata: {risultato['durata_s']} s   throughput: {risultato['throughput_passi_s']} passi/s   "
+          f"CPU server: {risultato['cpu_server_percento']}%   CPU client: {risultato['cpu_client_percento']}%")
+    print(f"memoria server: {risultato['rss_base_mb']} MB dopo il riscaldamento, "
+          f"{risultato['rss_finale_mb']} MB con le sessioni connesse "
+          f"(+{risultato['rss_per_sessione_mb']} MB per sessione), picco {risultato['rss_picco_mb']} MB")
+    for passo, r in risultato["passi"].items():
+        if r["ultimo_errore"]:
+            print(f"❌ {passo}: {r['ultimo_errore']}")
+
+
+def esegui_livello(sessioni, args):
+    """
+    Prepara i dati in una cartella temporanea, avvia un server nuovo e misura 'sessioni' sessioni.
+    """
+    cartella_originale = os.getcwd()
+    cartella_lavoro = tempfile.mkdtemp(prefix="incentivi_carico_")
+    os.chdir(cartella_lavoro)
+    server = None
+    try:
+        dati = genera_dati(args.dipendenti, args.kpi, args.mesi, args.seed)
+        aziende = prepara_archivi(args.aziende, dati)
+        del dati
+
+        porta = _porta_libera()
+        server = avvia_server(cartella_lavoro, porta)
+        cpu_client = time.process_time()
+        misure, durata, memoria, cpu = asyncio.run(prova(porta, server.pid, aziende, sessioni, args.iterazioni, args.seed))
+        cpu_client = time.process_time() - cpu_client
+    finally:
+        if server is not None:
+            ferma_server(server)
+        os.chdir(cartella_originale)
+        shutil.rmtree(cartella_lavoro, ignore_errors=True)
+    return riepilogo(misure, durata, sessioni, memoria, cpu, cpu_client)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Test di carico con sessioni HR simultanee su un server Streamlit")
+    parser.add_argument("--sessioni", default="1,5,10", help="sessioni simultanee, anche più livelli separati da virgole")
+    parser.add_argument("--iterazioni", type=int, default=3, help="ripetizioni dei flussi per sessione")
+    parser.add_argument("--dipendenti", type=int, default=300, help="dipendenti nel dataset sintetico")
+    parser.add_argument("--kpi", type=int, default=3, help="KPI per dipendente")
+    parser.add_argument("--mesi", type=int, default=24, help="mesi di storico per KPI")
+    parser.add_argument("--aziende", type=int, default=1, help="aziende su cui distribuire le sessioni")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", help="salva i risultati in questo file")
+    args = parser.parse_args(argv)
+
+    sys.path.insert(0, CARTELLA_PROGETTO)
+    risultati = []
+    for sessioni in [int(n) for n in args.sessioni.split(",")]:
+        risultato = esegui_livello(sessioni, args)
+        risultato["parametri"] = vars(args)
+        stampa(risultato)
+        risultati.append(risultato)
+
+    if len(risultati) > 1:
+        # Tutti i passi insieme: come cambiano latenza, throughput e memoria con le sessioni
+        print(f"\n{'Sessioni':>8} {'p50 ms':>9} {'p90 ms':>9} {'passi/s':>8} {'CPU server':>11} {'MB/sessione':>12}")
+        for r in risultati:
+            print(
+                f"{r['sessioni']:>8} {r['p50_ms']:>9.1f} {r['p90_ms']:>9.1f} {r['throughput_passi_s']:>8} "
+                f"{r['cpu_server_percento']:>10}% {r['rss_per_sessione_mb']:>12}"
+            )
+    if args.json:
+        with open(args.json, "w") as file:
+            json.dump(risultati, file, indent=4)
+    return 1 if any(p["errori"] for r in risultati for p in r["passi"].values()) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,163 @@
+from bisect import bisect_right
+
+# ----------------------------------------------------------------------------
+# MOTORE DI CALCOLO INCENTIVI
+# ----------------------------------------------------------------------------
+# Unica implementazione delle regole usata sia dalla "Dashboard Avanzata" sia da
+# "Report e Analisi". Ogni modifica va verificata con:
+#     python -m verifica.verifica_calcolo
+
+TIPI_INCENTIVO = [
+    "Importo fisso",
+    "% sul risultato",
+    "% sul salario mensile",
+    "Importo fisso x risultato",
+    "Scaglioni"
+]
+
+
+def normalizza_scaglioni(scaglioni):
+    """
+    Porta gli scaglioni nella forma (soglia, premio, percentuale) e li ordina per soglia.
+    I vecchi scaglioni a due elementi ricevono percentuale 0.
+    """
+    scaglioni_corretto = [(s[0], s[1], s[2] if len(s) > 2 else 0) for s in scaglioni]
+    return sorted(scaglioni_corretto, key=lambda x: x[0])
+
+
+def risultati_per_mese(storico_risultati):
+    """
+    Somma i risultati dello storico per mese ('YYYY-MM').
+    """
+    risultati_mensili = {}
+    for entry in storico_risultati:
+        mese = entry["data"][:7]
+        risultati_mensili[mese] = risultati_mensili.get(mese, 0) + entry["valore_raggiunto"]
+    return risultati_mensili
+
+
+def prepara_kpi(kpi_details):
+    """
+    Pre-calcola una sola volta per KPI gli scaglioni ordinati e le relative soglie,
+    invece di riordinarli per ogni mese.
+    """
+    scaglioni = normalizza_scaglioni(kpi_details.get("scaglioni", []))
+    soglie = [s[0] for s in scaglioni]
+    return scaglioni, soglie
+
+
+def _incentivo_scaglione(incentive_type, valore_totale, salario_mensile, scaglione, dettaglio):
+    soglia, premio_scaglione, percentuale_scaglione = scaglione
+    incentivo = 0
+    if incentive_type == "% sul risultato":
+        incentivo = (valore_totale * percentuale_scaglione) / 100
+        if dettaglio is not None:
+            dettaglio.append(f"{valore_totale} × {percentuale_scaglione}% = {incentivo} EUR")
+    elif incentive_type == "% sul salario mensile":
+        incentivo = (salario_mensile * percentuale_scaglione) / 100
+        if dettaglio is not None:
+            dettaglio.append(f"{salario_mensile} × {percentuale_scaglione}% = {incentivo} EUR")
+    elif incentive_type == "Importo fisso":
+        incentivo = premio_scaglione
+        if dettaglio is not None:
+            dettaglio.append(f"Incentivo fisso per soglia {soglia}: {incentivo} EUR")
+    # "Importo fisso x risultato" e "Scaglioni" non sono gestiti a scaglioni: incentivo 0
+    return incentivo
+
+
+def calcola_incentivo_kpi(kpi_details, valore_totale, salario_mensile, kpi_preparato=None, con_dettaglio=True):
+    """
+    Calcola l'incentivo di un KPI per il risultato complessivo di un mese.
+    Restituisce (incentivo, profitto_generato, dettaglio), dove 'dettaglio' è la lista
+    delle righe di calcolo mostrate in "Report e Analisi" (vuota se con_dettaglio=False).
+    """
+    if kpi_preparato is None:
+        kpi_preparato = prepara_kpi(kpi_details)
+    scaglioni, soglie = kpi_preparato
+
+    incentivo = 0
+    profitto_generato = 0
+    dettaglio = [] if con_dettaglio else None
+    valore_minimo = kpi_details.get("risultato_minimo", 0)
+
+    if valore_totale >= valore_minimo:
+        incentive_type = kpi_details["incentive_type"]
+        if scaglioni:
+            # Numero di scaglioni raggiunti: vale l'ultimo (soglia più alta)
+            raggiunti = bisect_right(soglie, valore_totale)
+            if raggiunti:
+                if con_dettaglio:
+                    for scaglione in scaglioni[:raggiunti]:
+                        incentivo = _incentivo_scaglione(incentive_type, valore_totale, salario_mensile, scaglione, dettaglio)
+                else:
+                    incentivo = _incentivo_scaglione(incentive_type, valore_totale, salario_mensile, scaglioni[raggiunti - 1], None)
+                profitto_generato = valore_totale
+        else:
+            premio_base = kpi_details["premio"]
+            if incentive_type == "Importo fisso x risultato":
+                incentivo = valore_totale * premio_base
+                if con_dettaglio:
+                    dettaglio.append(f"{valore_totale} × {premio_base} = {incentivo} EUR")
+            elif incentive_type == "Importo fisso":
+                incentivo = premio_base
+                if con_dettaglio:
+                    dettaglio.append(f"Incentivo fisso: {incentivo} EUR")
+            elif incentive_type == "% sul risultato":
+                incentivo = (valore_totale * premio_base) / 100
+                if con_dettaglio:
+                    dettaglio.append(f"{valore_totale} × {premio_base}% = {incentivo} EUR")
+            elif incentive_type == "% sul salario mensile":
+                incentivo = (salario_mensile * premio_base) / 100
+                if con_dettaglio:
+                    dettaglio.append(f"{salario_mensile} × {premio_base}% = {incentivo} EUR")
+            profitto_generato = valore_totale
+    elif con_dettaglio:
+        dettaglio.append(f"❌ Valore sotto soglia minima {valore_minimo}, nessun incentivo.")
+
+    return incentivo, profitto_generato, dettaglio or []
+
+
+def calcola_incentivi_mensili(emp, con_dettaglio=True, mesi_esclusi=None):
+    """
+    Calcola gli incentivi di tutti i KPI del dipendente 'emp', mese per mese.
+    Restituisce {mese: {kpi_name: {"totale", "dettaglio", "valore_raggiunto", "profitto"}}}.
+    I mesi in 'mesi_esclusi' (es. i mesi già chiusi, vedi chiusure.py) non vengono calcolati.
+    """
+    incentivi_mensili = {}
+    salario_mensile = emp.get("salario_mensile", 0)
+
+    for kpi_name, kpi_details in emp.get("kpis", {}).items():
+        if "storico_risultati" not in kpi_details:
+            continue
+        kpi_preparato = prepara_kpi(kpi_details)
+
+        for mese, valore_totale in risultati_per_mese(kpi_details["storico_risultati"]).items():
+            if mesi_esclusi and mese in mesi_esclusi:
+                continue
+            incentivo, profitto_generato, dettaglio = calcola_incentivo_kpi(
+                kpi_details, valore_totale, salario_mensile, kpi_preparato, con_dettaglio
+            )
+            incentivi_mensili.setdefault(mese, {})[kpi_name] = {
+                "totale": incentivo,
+                "dettaglio": "\n".join(dettaglio),
+                "valore_raggiunto": valore_totale,
+                "profitto": profitto_generato
+            }
+
+    return incentivi_mensili
+
+
+def totali_mensili(incentivi_mensili):
+    """
+    Aggrega per mese gli incentivi e il profitto di tutti i KPI.
+    Restituisce {mese: {"totale_incentivi", "profitto"}}.
+    """
+    totali = {}
+    for mese, kpi_data in incentivi_mensili.items():
+        totale_incentivi = 0
+        profitto = 0
+        for info in kpi_data.values():
+            totale_incentivi += info["totale"]
+            profitto += info["profitto"]
+        totali[mese] = {"totale_incentivi": totale_incentivi, "profitto": profitto}
+    return totali
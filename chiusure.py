@@ -0,0 +1,122 @@
+from collections import Counter
+from datetime import datetime
+
+from calcolo import calcola_incentivi_mensili
+
+# ----------------------------------------------------------------------------
+# CHIUSURA MESI
+# ----------------------------------------------------------------------------
+# Chiudere un mese congela, per ogni dipendente con risultati in quel mese, gli
+# incentivi calcolati (totali, dettaglio, valore raggiunto, profitto) insieme a
+# nome, ruolo, stipendio e PPF del momento. I mesi chiusi vengono poi letti dalla foto
+# salvata in data["mesi_chiusi"], senza ricalcolo: modifiche successive a KPI,
+# risultati o anagrafica non cambiano più lo storico. Solo i mesi aperti sono
+# calcolati al momento. Le foto sono indicizzate per emp_id: gli id dei dipendenti
+# non vengono mai riassegnati (nuovo_id_dipendente) e i risultati dei mesi chiusi
+# non si possono più aggiungere, modificare o eliminare (mesi_chiusi_modificati).
+
+
+def mesi_chiusi(data):
+    return data.get("mesi_chiusi", {})
+
+
+def mese_chiuso(data, mese):
+    return mese in mesi_chiusi(data)
+
+
+def nuovo_id_dipendente(data):
+    """
+    Id per un nuovo dipendente: il più alto tra anagrafica e foto dei mesi chiusi, più uno.
+    Così l'id di un dipendente eliminato non passa mai a un altro.
+    """
+    usati = set(data["employees"])
+    for chiusura in mesi_chiusi(data).values():
+        usati.update(chiusura["dipendenti"])
+    return str(max((int(emp_id) for emp_id in usati if emp_id.isdigit()), default=0) + 1)
+
+
+def mesi_chiusi_modificati(data, storico_prima, storico_dopo):
+    """
+    Mesi chiusi i cui risultati cambiano passando da 'storico_prima' a 'storico_dopo'
+    (righe modificate, eliminate, aggiunte o spostate in un mese chiuso), in ordine.
+    """
+    def righe_chiuse(storico):
+        return Counter(
+            (str(r["data"]), r["valore_raggiunto"]) for r in storico if mese_chiuso(data, str(r["data"])[:7])
+        )
+
+    differenza = righe_chiuse(storico_prima)
+    differenza.subtract(righe_chiuse(storico_dopo))
+    return sorted({data_risultato[:7] for (data_risultato, _), numero in differenza.items() if numero})
+
+
+def mesi_con_risultati(data):
+    mesi = set()
+    for emp in data["employees"].values():
+        for kpi_details in emp.get("kpis", {}).values():
+            for entry in kpi_details.get("storico_risultati", []):
+                mesi.add(entry["data"][:7])
+    return sorted(mesi)
+
+
+def mesi_aperti(data):
+    chiusi = mesi_chiusi(data)
+    return [mese for mese in mesi_con_risultati(data) if mese not in chiusi]
+
+
+def chiudi_mese(data, mese):
+    """
+    Congela gli incentivi del mese 'mese' per tutti i dipendenti in data["mesi_chiusi"][mese].
+    Il salvataggio su file resta a carico del chiamante (es. con dati.modifica_dati).
+    """
+    if mese_chiuso(data, mese):
+        raise ValueError(f"Il mese {mese} è già chiuso.")
+
+    dipendenti = {}
+    totale_incentivi = 0
+    for emp_id, emp in data["employees"].items():
+        kpi_data = calcola_incentivi_mensili(emp).get(mese)
+        if not kpi_data:
+            continue
+        totale_dipendente = sum(info["totale"] for info in kpi_data.values())
+        dipendenti[emp_id] = {
+            "name": emp.get("name", ""),
+            "ruolo": emp.get("ruolo", ""),
+            "salario_mensile": emp.get("salario_mensile", 0),
+            "ppf": emp.get("ppf", ""),
+            "kpis": kpi_data,
+            "totale_incentivi": totale_dipendente
+        }
+        totale_incentivi += totale_dipendente
+
+    data.setdefault("mesi_chiusi", {})[mese] = {
+        "chiuso_il": datetime.now().isoformat(timespec="seconds"),
+        "totale_incentivi": totale_incentivi,
+        "dipendenti": dipendenti
+    }
+    return data["mesi_chiusi"][mese]
+
+
+def foto_dipendente(data, emp_id, mese):
+    """
+    Dati congelati del dipendente per un mese chiuso ({"name", "ruolo", "salario_mensile",
+    "ppf", "kpis", "totale_incentivi"}), oppure None se il mese è aperto o il dipendente non ha risultati.
+    """
+    chiusura = mesi_chiusi(data).get(mese)
+    if chiusura is None:
+        return None
+    return chiusura["dipendenti"].get(emp_id)
+
+
+def incentivi_dipendente(data, emp_id, emp, con_dettaglio=True):
+    """
+    Come calcolo.calcola_incentivi_mensili, ma i mesi chiusi vengono letti dalla foto
+    invece di essere ricalcolati. Le voci dei mesi chiusi vanno trattate in sola lettura.
+    """
+    chiusi = mesi_chiusi(data)
+    incentivi_mensili = calcola_incentivi_mensili(emp, con_dettaglio, mesi_esclusi=chiusi)
+    for mese, chiusura in chiusi.items():
+        foto = chiusura["dipendenti"].get(emp_id)
+        if foto:
+            incentivi_mensili[mese] = dict(foto["kpis"])
+    return incentivi_mensili
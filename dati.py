@@ -0,0 +1,372 @@
+import json
+import os
+import re
+import threading
+from collections import OrderedDict
+
+from anomalie import aggiorna_statistiche, costruisci_statistiche
+
+# ----------------------------------------------------------------------------
+# ARCHIVI PER AZIENDA
+# ----------------------------------------------------------------------------
+# Ogni azienda ha il proprio file: l'azienda predefinita usa ancora DATA_FILE,
+# le altre aziende/<nome>.json. Per ogni azienda esiste un solo ArchivioAzienda
+# per processo, condiviso da tutte le sessioni, con un lock proprio: il salvataggio
+# di un'azienda non rallenta caricamenti e salvataggi delle altre. Ogni esecuzione
+# di una pagina legge il file e riceve una copia propria dei dati; le pagine salvano
+# con modifica_dati, che applica la modifica all'ultima versione salvata sotto il
+# lock dell'azienda. In memoria restano solo i dati derivati (statistiche, riepiloghi),
+# ricalcolati quando il file cambia e tenuti per le MASSIMO_AZIENDE_IN_CACHE aziende
+# usate più di recente.
+
+DATA_FILE = "incentives_data.json"
+CARTELLA_AZIENDE = "aziende"
+AZIENDA_PREDEFINITA = "Predefinita"
+DIMENSIONE_BLOCCO = 1 << 16  # caratteri letti per volta dalle letture a blocchi
+MASSIMO_AZIENDE_IN_CACHE = 8
+
+_cache_derivati = OrderedDict()  # percorso -> {nome: (versione, valore)}, in ordine di utilizzo
+_lock_derivati = threading.Lock()
+
+
+def _firma_file(percorso):
+    try:
+        stat = os.stat(percorso)
+    except FileNotFoundError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+def _leggi_derivato(percorso, nome, versione):
+    with _lock_derivati:
+        derivati = _cache_derivati.get(percorso)
+        if derivati is None:
+            return None
+        _cache_derivati.move_to_end(percorso)
+        voce = derivati.get(nome)
+    return voce[1] if voce is not None and voce[0] == versione else None
+
+
+def _salva_derivato(percorso, nome, versione, valore):
+    with _lock_derivati:
+        _cache_derivati.setdefault(percorso, {})[nome] = (versione, valore)
+        _cache_derivati.move_to_end(percorso)
+        while len(_cache_derivati) > MASSIMO_AZIENDE_IN_CACHE:
+            _cache_derivati.popitem(last=False)
+
+
+class ArchivioAzienda:
+    def __init__(self, percorso):
+        self.percorso = percorso
+        self.lock = threading.RLock()
+        self._lock_calcolo = threading.Lock()
+        self._salvataggi = 0
+
+    def _leggi(self):
+        try:
+            with open(self.percorso, "r") as file:
+                return json.load(file)
+        except FileNotFoundError:
+            return {"employees": {}}
+
+    def carica(self):
+        """
+        Dati dell'azienda letti dal file, per una sola esecuzione della pagina: ogni
+        sessione riceve oggetti propri, così le modifiche non salvate di una sessione
+        non arrivano mai alle altre né al file.
+        """
+        return self._leggi()
+
+    def salva(self, data):
+        with self.lock:
+            cartella = os.path.dirname(self.percorso)
+            if cartella:
+                os.makedirs(cartella, exist_ok=True)
+            # I mesi chiusi vanno prima dei dipendenti: le letture a blocchi (scorri_dati)
+            # li trovano senza dover attraversare tutto lo storico
+            if "mesi_chiusi" in data:
+                da_scrivere = {"mesi_chiusi": data["mesi_chiusi"]}
+                da_scrivere.update((k, v) for k, v in data.items() if k != "mesi_chiusi")
+            else:
+                da_scrivere = data
+            # Serializzazione prima di toccare il file: se i dati non sono validi
+            # (es. date pandas) il file resta quello precedente
+            testo = json.dumps(da_scrivere, indent=4)
+            # Scrittura su file temporaneo + rename: chi legge non vede mai un file a metà.
+            # Nome del temporaneo diverso per processo, se più processi usano lo stesso archivio
+            temporaneo = f"{self.percorso}.{os.getpid()}.tmp"
+            with open(temporaneo, "w") as file:
+                file.write(testo)
+            os.replace(temporaneo, self.percorso)
+            self._salvataggi += 1
+
+    def modifica(self, modifica):
+        """
+        Applica modifica(data) all'ultima versione salvata dei dati e la salva, tutto sotto
+        il lock: due sessioni che salvano insieme non si sovrascrivono le modifiche.
+        Restituisce il valore restituito da 'modifica'.
+        """
+        with self.lock:
+            data = self._leggi()
+            risultato = modifica(data)
+            self.salva(data)
+            return risultato
+
+    def firma(self):
+        """
+        Versione dei dati salvati: cambia a ogni salvataggio di questo processo e a ogni
+        modifica del file dall'esterno (mtime, dimensione).
+        """
+        with self.lock:
+            return (self._salvataggi, _firma_file(self.percorso))
+
+    def derivato(self, nome, calcola):
+        """
+        Valore calcolato dai dati salvati con calcola() (es. statistiche, riepiloghi),
+        riusato finché il file non cambia. Il calcolo avviene fuori dal lock dei
+        salvataggi e una sola volta anche se più sessioni lo chiedono insieme.
+        Il valore è condiviso tra le sessioni: va usato in sola lettura.
+        """
+        versione = self.firma()
+        valore = _leggi_derivato(self.percorso, nome, versione)
+        if valore is not None:
+            return valore
+        with self._lock_calcolo:
+            versione = self.firma()
+            valore = _leggi_derivato(self.percorso, nome, versione)
+            if valore is None:
+                # Se il file cambia durante il calcolo, la versione salvata è già vecchia
+                # e il valore verrà ricalcolato alla prossima richiesta
+                valore = calcola()
+                _salva_derivato(self.percorso, nome, versione, valore)
+            return valore
+
+    def statistiche(self):
+        """
+        Statistiche dei risultati per (emp_id, kpi_name) (vedi anomalie.py), calcolate
+        leggendo il file a blocchi una volta per versione, non a ogni esecuzione.
+        """
+        return self.derivato(
+            "statistiche",
+            lambda: costruisci_statistiche(scorri_sezione(self.percorso, "employees"))
+        )
+
+    def aggiungi_risultati(self, righe):
+        """
+        Aggiunge le righe (emp_id, kpi_name, data, valore) agli storici dei KPI e salva.
+        Le statistiche già calcolate vengono aggiornate riga per riga invece di essere
+        ricalcolate; le voci toccate sono sostituite, mai modificate, così chi le sta
+        leggendo in un'altra sessione non vede valori a metà.
+        """
+        def aggiungi(data):
+            for emp_id, kpi_name, data_risultato, valore in righe:
+                kpi_details = data["employees"][emp_id]["kpis"][kpi_name]
+                kpi_details.setdefault("storico_risultati", []).append({
+                    "data": data_risultato,
+                    "valore_raggiunto": valore
+                })
+
+        with self.lock:
+            statistiche = _leggi_derivato(self.percorso, "statistiche", self.firma())
+            self.modifica(aggiungi)
+            if statistiche is not None:
+                for emp_id, kpi_name, _, valore in righe:
+                    chiave = (emp_id, kpi_name)
+                    if chiave in statistiche:
+                        statistiche[chiave] = list(statistiche[chiave])
+                    aggiorna_statistiche(statistiche, chiave, valore)
+                _salva_derivato(self.percorso, "statistiche", self.firma(), statistiche)
+
+
+_archivi = {}
+_lock_archivi = threading.Lock()
+
+
+def percorso_azienda(azienda):
+    if azienda == AZIENDA_PREDEFINITA:
+        return DATA_FILE
+    return os.path.join(CARTELLA_AZIENDE, f"{azienda}.json")
+
+
+def elenco_aziende():
+    aziende = []
+    if os.path.isdir(CARTELLA_AZIENDE):
+        aziende = sorted(
+            nome[:-len(".json")]
+            for nome in os.listdir(CARTELLA_AZIENDE)
+            if nome.endswith(".json")
+        )
+    return [AZIENDA_PREDEFINITA] + [a for a in aziende if a != AZIENDA_PREDEFINITA]
+
+
+def archivio(azienda):
+    """
+    Archivio dell'azienda, creato alla prima richiesta e poi riusato da tutte le sessioni.
+    Non tiene dati in memoria: solo percorso, lock e contatore dei salvataggi.
+    """
+    with _lock_archivi:
+        if azienda not in _archivi:
+            _archivi[azienda] = ArchivioAzienda(percorso_azienda(azienda))
+        return _archivi[azienda]
+
+
+def crea_azienda(nome):
+    nome = nome.strip()
+    if not re.fullmatch(r"\w[\w .\-]*", nome) or nome == AZIENDA_PREDEFINITA:
+        raise ValueError("Nome azienda non valido: usare lettere, numeri, spazi, '.', '-' o '_'.")
+    if nome in elenco_aziende():
+        raise ValueError(f"L'azienda {nome} esiste già.")
+    save_data({"employees": {}}, nome)
+    return nome
+
+
+def load_data(azienda=AZIENDA_PREDEFINITA):
+    return archivio(azienda).carica()
+
+
+def save_data(data, azienda=AZIENDA_PREDEFINITA):
+    archivio(azienda).salva(data)
+
+
+def modifica_dati(azienda, modifica):
+    """
+    Modifica e salvataggio atomici rispetto alle altre sessioni (vedi ArchivioAzienda.modifica).
+    """
+    return archivio(azienda).modifica(modifica)
+
+
+def aggiungi_risultati(azienda, righe):
+    archivio(azienda).aggiungi_risultati(righe)
+
+
+def statistiche_risultati(azienda):
+    return archivio(azienda).statistiche()
+
+
+def firma_dati(azienda):
+    return archivio(azienda).firma()
+
+
+# ----------------------------------------------------------------------------
+# LETTURA A BLOCCHI
+# ----------------------------------------------------------------------------
+# Per elaborare archivi con anni di storico senza caricarli interi: il file viene
+# letto a blocchi e le voci di una sezione (es. un dipendente di "employees", un
+# mese di "mesi_chiusi") vengono decodificate e restituite una alla volta. In
+# memoria c'è al massimo un blocco più la voce corrente. Usata da flusso.py (dashboard
+# ed export da riga di comando); verificata con python -m verifica.verifica_lettura.
+
+_SPAZI = re.compile(r"[ \t\n\r]*")
+_DECODER = json.JSONDecoder()
+_CONTINUA_NUMERO = frozenset("0123456789.eE+-")
+
+
+class _LettoreJSON:
+    def __init__(self, file, dimensione_blocco):
+        self.file = file
+        self.dimensione_blocco = dimensione_blocco
+        self.buffer = ""
+        self.pos = 0
+        self.finito = False
+
+    def _leggi_altro(self):
+        """
+        Aggiunge testo al buffer scartando quello già consumato. Se la voce corrente non
+        sta nel buffer, ne legge almeno altrettanto: il costo resta lineare.
+        """
+        if self.finito:
+            return False
+        resto = self.buffer[self.pos:]
+        testo = self.file.read(max(self.dimensione_blocco, len(resto)))
+        if not testo:
+            self.finito = True
+            return False
+        self.buffer = resto + testo
+        self.pos = 0
+        return True
+
+    def carattere(self):
+        """
+        Primo carattere significativo (senza consumarlo), "" a fine file.
+        """
+        while True:
+            self.pos = _SPAZI.match(self.buffer, self.pos).end()
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self._leggi_altro():
+                return ""
+
+    def consuma(self, atteso):
+        carattere = self.carattere()
+        if carattere not in atteso:
+            raise ValueError(f"JSON non valido: atteso {atteso!r}, trovato {carattere!r}")
+        self.pos += 1
+        return carattere
+
+    def valore(self):
+        self.carattere()
+        while True:
+            try:
+                valore, fine = _DECODER.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError:
+                if self._leggi_altro():
+                    continue
+                raise
+            # Un numero troncato dal confine del blocco ("150." | "25", "1e-" | "07") viene
+            # decodificato come il suo prefisso valido: se finisce a fine buffer o è seguito
+            # da un carattere che può continuarlo, va riletto con il blocco successivo
+            if (
+                isinstance(valore, (int, float))
+                and (fine == len(self.buffer) or self.buffer[fine] in _CONTINUA_NUMERO)
+                and self._leggi_altro()
+            ):
+                continue
+            self.pos = fine
+            return valore
+
+
+def scorri_sezione(percorso, sezione, dimensione_blocco=DIMENSIONE_BLOCCO):
+    """
+    Restituisce una alla volta le coppie (chiave, valore) dell'oggetto di primo livello
+    'sezione' del file JSON, leggendo il file a blocchi. La lettura si ferma alla fine
+    della sezione; le sezioni precedenti vengono attraversate voce per voce.
+    """
+    try:
+        file = open(percorso, "r")
+    except FileNotFoundError:
+        return
+    with file:
+        lettore = _LettoreJSON(file, dimensione_blocco)
+        lettore.consuma("{")
+        if lettore.carattere() == "}":
+            return
+        while True:
+            nome = lettore.valore()
+            lettore.consuma(":")
+            if lettore.carattere() == "{":
+                lettore.consuma("{")
+                if lettore.carattere() == "}":
+                    lettore.consuma("}")
+                else:
+                    while True:
+                        chiave = lettore.valore()
+                        lettore.consuma(":")
+                        valore = lettore.valore()
+                        if nome == sezione:
+                            yield chiave, valore
+                        if lettore.consuma(",}") == "}":
+                            break
+                if nome == sezione:
+                    return
+            else:
+                lettore.valore()
+            if lettore.consuma(",}") == "}":
+                return
+
+
+def scorri_dati(azienda, sezione, dimensione_blocco=DIMENSIONE_BLOCCO):
+    """
+    Voci della sezione 'sezione' dell'archivio dell'azienda, lette a blocchi dal file
+    (vedi scorri_sezione). Non usa né modifica i dati in memoria dell'ArchivioAzienda.
+    """
+    return scorri_sezione(percorso_azienda(azienda), sezione, dimensione_blocco)
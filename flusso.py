@@ -0,0 +1,195 @@
+"""
+Calcoli ed export sull'intera azienda elaborando l'archivio a blocchi.
+
+Invece di caricare tutto l'archivio, i dati vengono letti con dati.scorri_dati:
+prima i mesi chiusi (una chiusura mensile alla volta), poi i dipendenti (uno alla
+volta, con i loro KPI e risultati). Ogni blocco viene calcolato e sommato nei
+totali mensili, o scritto subito nel CSV, e poi scartato: la memoria dipende dalla
+dimensione del blocco e del singolo dipendente, non dallo storico complessivo.
+
+Legge solo quanto è salvato su disco. Nell'app la dashboard usa questi calcoli al
+posto di load_data: riepiloghi mensili per dipendente e totali aziendali sono
+calcolati una volta per versione dell'archivio (riepiloghi_salvati, totali_salvati)
+e condivisi tra le sessioni, quindi la pagina non carica mai l'archivio completo.
+
+Uso da riga di comando (dalla cartella del progetto):
+    python -m flusso [--azienda Predefinita] [--csv incentivi.csv]
+"""
+import argparse
+import csv
+import sys
+
+from calcolo import calcola_incentivi_mensili, totali_mensili
+from dati import AZIENDA_PREDEFINITA, DIMENSIONE_BLOCCO, archivio, scorri_dati
+from gruppi import valore_ppf, voce_riepilogo
+
+COLONNE_EXPORT = [
+    "Mese",
+    "ID Dipendente",
+    "Dipendente",
+    "Ruolo",
+    "KPI",
+    "Valore Raggiunto",
+    "Incentivo (EUR)",
+    "Profitto (EUR)",
+    "Stato Mese"
+]
+
+
+def _aggiungi(totali, mese, stipendio, incentivi, ppf, profitto):
+    totale = totali.get(mese)
+    if totale is None:
+        totale = totali[mese] = {
+            "dipendenti": 0, "stipendio": 0, "incentivi": 0, "compenso": 0, "ppf": 0, "profitto": 0,
+            "compenso_con_ppf": 0
+        }
+    totale["dipendenti"] += 1
+    totale["stipendio"] += stipendio
+    totale["incentivi"] += incentivi
+    totale["compenso"] += stipendio + incentivi
+    totale["ppf"] += ppf
+    totale["profitto"] += profitto
+    if ppf > 0:
+        totale["compenso_con_ppf"] += stipendio + incentivi
+
+
+def _totali_foto(foto):
+    """
+    (incentivi, profitto) di un dipendente in un mese chiuso, dalla sua foto.
+    """
+    incentivi = 0
+    profitto = 0
+    for info in foto["kpis"].values():
+        incentivi += info["totale"]
+        profitto += info["profitto"]
+    return incentivi, profitto
+
+
+def totali_mensili_azienda(azienda, dimensione_blocco=DIMENSIONE_BLOCCO):
+    """
+    Totali mensili di tutta l'azienda, come gruppi.riepilogo_gruppo su tutti i dipendenti:
+    {mese: {"dipendenti", "stipendio", "incentivi", "compenso", "ppf", "profitto", "compenso_con_ppf"}}.
+    """
+    totali = {}
+    chiusi = set()
+
+    for mese, chiusura in scorri_dati(azienda, "mesi_chiusi", dimensione_blocco):
+        chiusi.add(mese)
+        for foto in chiusura["dipendenti"].values():
+            incentivi, profitto = _totali_foto(foto)
+            _aggiungi(totali, mese, foto.get("salario_mensile", 0), incentivi, valore_ppf(foto), profitto)
+
+    for emp_id, emp in scorri_dati(azienda, "employees", dimensione_blocco):
+        stipendio = emp.get("salario_mensile", 0)
+        ppf = valore_ppf(emp)
+        incentivi_mensili = calcola_incentivi_mensili(emp, con_dettaglio=False, mesi_esclusi=chiusi)
+        for mese, totale in totali_mensili(incentivi_mensili).items():
+            _aggiungi(totali, mese, stipendio, totale["totale_incentivi"], ppf, totale["profitto"])
+
+    return totali
+
+
+def riepiloghi_dipendenti(azienda, dimensione_blocco=DIMENSIONE_BLOCCO):
+    """
+    Per ogni dipendente in anagrafica {emp_id: {"name", "ruolo", "riepilogo"}}, dove
+    "riepilogo" è quello di gruppi.riepilogo_dipendente ({mese: voce_riepilogo(...)}).
+    Dei mesi chiusi si tengono solo le voci mensili, non le foto complete; dei dipendenti
+    solo nome, ruolo e riepilogo, non KPI e storici.
+    """
+    voci_chiuse = {}  # emp_id -> {mese: voce} dei mesi chiusi
+    chiusi = set()
+
+    for mese, chiusura in scorri_dati(azienda, "mesi_chiusi", dimensione_blocco):
+        chiusi.add(mese)
+        for emp_id, foto in chiusura["dipendenti"].items():
+            incentivi, profitto = _totali_foto(foto)
+            voci_chiuse.setdefault(emp_id, {})[mese] = voce_riepilogo(
+                foto.get("salario_mensile", 0), incentivi, valore_ppf(foto), profitto
+            )
+
+    riepiloghi = {}
+    for emp_id, emp in scorri_dati(azienda, "employees", dimensione_blocco):
+        stipendio = emp.get("salario_mensile", 0)
+        ppf = valore_ppf(emp)
+        incentivi_mensili = calcola_incentivi_mensili(emp, con_dettaglio=False, mesi_esclusi=chiusi)
+        riepilogo = {
+            mese: voce_riepilogo(stipendio, totale["totale_incentivi"], ppf, totale["profitto"])
+            for mese, totale in totali_mensili(incentivi_mensili).items()
+        }
+        riepilogo.update(voci_chiuse.pop(emp_id, {}))
+        riepiloghi[emp_id] = {"name": emp.get("name", ""), "ruolo": emp.get("ruolo", ""), "riepilogo": riepilogo}
+
+    return riepiloghi
+
+
+def riepiloghi_salvati(azienda):
+    """
+    riepiloghi_dipendenti dell'ultima versione salvata, calcolati una volta per versione
+    e condivisi tra le sessioni (vedi ArchivioAzienda.derivato): da usare in sola lettura.
+    """
+    return archivio(azienda).derivato("riepiloghi_dipendenti", lambda: riepiloghi_dipendenti(azienda))
+
+
+def totali_salvati(azienda):
+    """
+    totali_mensili_azienda dell'ultima versione salvata, come riepiloghi_salvati.
+    """
+    return archivio(azienda).derivato("totali_mensili", lambda: totali_mensili_azienda(azienda))
+
+
+def esporta_incentivi_csv(azienda, file_csv, dimensione_blocco=DIMENSIONE_BLOCCO):
+    """
+    Scrive in 'file_csv' una riga per (mese, dipendente, KPI): prima i mesi chiusi,
+    dalle chiusure, poi i mesi aperti calcolati al momento. Restituisce il numero di righe.
+    """
+    writer = csv.writer(file_csv)
+    writer.writerow(COLONNE_EXPORT)
+    righe = 0
+    chiusi = set()
+
+    for mese, chiusura in scorri_dati(azienda, "mesi_chiusi", dimensione_blocco):
+        chiusi.add(mese)
+        for emp_id, foto in chiusura["dipendenti"].items():
+            for kpi_name, info in foto["kpis"].items():
+                writer.writerow([
+                    mese, emp_id, foto.get("name", ""), foto.get("ruolo", ""), kpi_name,
+                    info["valore_raggiunto"], round(info["totale"], 2), round(info["profitto"], 2), "chiuso"
+                ])
+                righe += 1
+
+    for emp_id, emp in scorri_dati(azienda, "employees", dimensione_blocco):
+        incentivi_mensili = calcola_incentivi_mensili(emp, con_dettaglio=False, mesi_esclusi=chiusi)
+        for mese in sorted(incentivi_mensili.keys()):
+            for kpi_name, info in incentivi_mensili[mese].items():
+                writer.writerow([
+                    mese, emp_id, emp.get("name", ""), emp.get("ruolo", ""), kpi_name,
+                    info["valore_raggiunto"], round(info["totale"], 2), round(info["profitto"], 2), "aperto"
+                ])
+                righe += 1
+
+    return righe
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Totali mensili ed export CSV dell'azienda, a blocchi")
+    parser.add_argument("--azienda", default=AZIENDA_PREDEFINITA)
+    parser.add_argument("--csv", help="esporta gli incentivi per mese, dipendente e KPI in questo file")
+    parser.add_argument("--blocco", type=int, default=DIMENSIONE_BLOCCO, help="caratteri letti per volta")
+    args = parser.parse_args(argv)
+
+    if args.csv:
+        with open(args.csv, "w", newline="") as file:
+            righe = esporta_incentivi_csv(args.azienda, file, args.blocco)
+        print(f"✅ {righe} righe esportate in {args.csv}")
+        return 0
+
+    for mese, totale in sorted(totali_mensili_azienda(args.azienda, args.blocco).items()):
+        print(
+            f"{mese}  dipendenti {totale['dipendenti']:>6}  incentivi {totale['incentivi']:>14,.2f}  "
+            f"compenso {totale['compenso']:>16,.2f}  profitto {totale['profitto']:>16,.2f}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
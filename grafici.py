@@ -0,0 +1,116 @@
+import hashlib
+import io
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from datetime import datetime
+
+# ----------------------------------------------------------------------------
+# GRAFICI KPI CON CACHE
+# ----------------------------------------------------------------------------
+# I grafici sono immagini PNG memorizzate, in una cache separata per ogni azienda,
+# per (dipendente, KPI, versione dei dati):
+# la versione è un hash dei punti del grafico, quindi cambia da sola quando si
+# modificano risultati o regole del KPI. Le figure matplotlib vengono chiuse
+# subito dopo il rendering, così un processo server di lunga durata non accumula
+# memoria. Le stesse immagini vengono riusate nei PDF mensili, passando a fpdf un
+# file temporaneo che viene cancellato subito dopo: su disco non resta nulla.
+
+MASSIMO_GRAFICI = 256  # per azienda
+
+_cache_grafici = {}  # azienda -> OrderedDict
+_lock_grafici = threading.Lock()
+
+
+def serie_kpi(incentivi_mensili, kpi_name):
+    """
+    Punti (mese, incentivo, valore raggiunto) del KPI, in ordine di mese.
+    """
+    return tuple(
+        (mese, incentivi_mensili[mese][kpi_name]["totale"], incentivi_mensili[mese][kpi_name]["valore_raggiunto"])
+        for mese in sorted(incentivi_mensili.keys())
+        if kpi_name in incentivi_mensili[mese]
+    )
+
+
+def versione_serie(serie):
+    return hashlib.sha1(repr(serie).encode("utf-8")).hexdigest()
+
+
+def _disegna_grafico_kpi(kpi_name, serie):
+    import matplotlib.pyplot as plt
+    from PIL import Image
+
+    mesi = [datetime.strptime(mese + "-01", "%Y-%m-%d") for mese, _, _ in serie]
+    fig, ax = plt.subplots()
+    try:
+        ax.plot(mesi, [p[2] for p in serie], marker="o", linestyle="-", label="Valore Raggiunto")
+        ax.plot(mesi, [p[1] for p in serie], marker="s", linestyle="--", label="Incentivo (EUR)")
+        ax.set_ylabel("Valori e Incentivi")
+        ax.set_xlabel("Mese")
+        ax.set_title(f"Andamento KPI - {kpi_name}")
+        ax.tick_params(axis="x", labelrotation=45)
+        ax.legend()
+        fig.tight_layout()
+        buffer = io.BytesIO()
+        fig.savefig(buffer, format="png", dpi=100)
+    finally:
+        plt.close(fig)
+
+    # PNG senza canale alfa: fpdf non supporta la trasparenza
+    buffer.seek(0)
+    png = io.BytesIO()
+    Image.open(buffer).convert("RGB").save(png, format="PNG", optimize=True)
+    return png.getvalue()
+
+
+def grafico_kpi(azienda, emp_id, kpi_name, serie):
+    """
+    PNG del grafico del KPI; viene disegnato solo se non è già in cache per questa versione dei dati.
+    Ogni azienda ha la sua cache: i grafici di un'azienda non fanno uscire quelli delle altre.
+    """
+    chiave = (emp_id, kpi_name, versione_serie(serie))
+    with _lock_grafici:
+        cache = _cache_grafici.setdefault(azienda, OrderedDict())
+        png = cache.get(chiave)
+        if png is not None:
+            cache.move_to_end(chiave)
+            return png
+
+    png = _disegna_grafico_kpi(kpi_name, serie)
+
+    with _lock_grafici:
+        cache[chiave] = png
+        cache.move_to_end(chiave)
+        while len(cache) > MASSIMO_GRAFICI:
+            cache.popitem(last=False)
+    return png
+
+
+def grafici_dipendente(azienda, emp_id, emp, incentivi_mensili):
+    """
+    {kpi_name: PNG} per tutti i KPI del dipendente che hanno almeno un mese calcolato.
+    """
+    grafici = {}
+    for kpi_name in emp.get("kpis", {}).keys():
+        serie = serie_kpi(incentivi_mensili, kpi_name)
+        if serie:
+            grafici[kpi_name] = grafico_kpi(azienda, emp_id, kpi_name, serie)
+    return grafici
+
+
+@contextmanager
+def file_grafico(png):
+    """
+    Percorso di un file temporaneo con il PNG (fpdf accetta solo file), cancellato
+    all'uscita dal blocco with. fpdf legge l'immagine già in pdf.image().
+    """
+    descrittore, percorso = tempfile.mkstemp(prefix="incentivi_grafico_", suffix=".png")
+    try:
+        with os.fdopen(descrittore, "wb") as file:
+            file.write(png)
+        yield percorso
+    finally:
+        os.remove(percorso)
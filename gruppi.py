@@ -0,0 +1,100 @@
+from calcolo import totali_mensili
+from chiusure import foto_dipendente, incentivi_dipendente
+
+# ----------------------------------------------------------------------------
+# RAGGRUPPAMENTO PER RUOLO
+# ----------------------------------------------------------------------------
+
+SENZA_RUOLO = "Senza ruolo"
+
+
+def etichetta_ruolo(ruolo):
+    """
+    Ruolo con gli spazi normalizzati; i dipendenti senza ruolo finiscono in SENZA_RUOLO.
+    """
+    return " ".join(str(ruolo or "").split()) or SENZA_RUOLO
+
+
+def costruisci_indice_ruoli(employees):
+    """
+    Indice ruolo -> lista di emp_id, costruito con un solo passaggio sui dipendenti.
+    Ruoli che differiscono solo per maiuscole/minuscole finiscono nello stesso gruppo,
+    con l'etichetta della prima grafia incontrata.
+    """
+    indice = {}
+    etichette = {}
+    for emp_id, emp in employees.items():
+        etichetta = etichetta_ruolo(emp.get("ruolo", ""))
+        etichetta = etichette.setdefault(etichetta.casefold(), etichetta)
+        indice.setdefault(etichetta, []).append(emp_id)
+    return dict(sorted(indice.items()))
+
+
+def valore_ppf(emp):
+    """
+    PPF mensile come numero; 0 se non impostato o se è testo libero.
+    """
+    try:
+        return float(emp.get("ppf", 0) or 0)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def rapporto_percentuale(numeratore, denominatore):
+    return (numeratore / denominatore) * 100 if denominatore > 0 else 0
+
+
+def voce_riepilogo(stipendio, incentivi, ppf, profitto):
+    """
+    Voce mensile di un riepilogo: {"stipendio", "incentivi", "compenso", "ppf", "profitto"}.
+    """
+    return {
+        "stipendio": stipendio,
+        "incentivi": incentivi,
+        "compenso": stipendio + incentivi,
+        "ppf": ppf,
+        "profitto": profitto
+    }
+
+
+def riepilogo_dipendente(data, emp_id, emp):
+    """
+    Riepilogo mensile del dipendente per i mesi con risultati: {mese: voce_riepilogo(...)}.
+    Per i mesi chiusi stipendio e PPF sono quelli congelati alla chiusura.
+    Senza i dati completi in memoria: flusso.riepiloghi_dipendenti.
+    """
+    riepilogo = {}
+    for mese, totali in totali_mensili(incentivi_dipendente(data, emp_id, emp, con_dettaglio=False)).items():
+        foto = foto_dipendente(data, emp_id, mese)
+        riepilogo[mese] = voce_riepilogo(
+            (foto or emp).get("salario_mensile", 0),
+            totali["totale_incentivi"],
+            valore_ppf(foto or emp),
+            totali["profitto"]
+        )
+    return riepilogo
+
+
+def riepilogo_gruppo(riepiloghi, emp_ids):
+    """
+    Somma mese per mese i riepiloghi dei dipendenti 'emp_ids'
+    ('riepiloghi' è {emp_id: riepilogo_dipendente(emp)}).
+    Restituisce {mese: {"dipendenti", "stipendio", "incentivi", "compenso", "ppf", "profitto",
+    "compenso_con_ppf"}}: "compenso_con_ppf" somma il compenso dei soli dipendenti con un PPF
+    numerico ed è il numeratore corretto per il rapporto Compenso/PPF del gruppo.
+    """
+    gruppo = {}
+    for emp_id in emp_ids:
+        for mese, valori in riepiloghi[emp_id].items():
+            totale = gruppo.get(mese)
+            if totale is None:
+                totale = gruppo[mese] = {
+                    "dipendenti": 0, "stipendio": 0, "incentivi": 0, "compenso": 0, "ppf": 0, "profitto": 0,
+                    "compenso_con_ppf": 0
+                }
+            totale["dipendenti"] += 1
+            for chiave, valore in valori.items():
+                totale[chiave] += valore
+            if valori["ppf"] > 0:
+                totale["compenso_con_ppf"] += valori["compenso"]
+    return gruppo
@@ -0,0 +1,49 @@
+import streamlit as st
+
+from chiusure import chiudi_mese, mesi_aperti, mesi_chiusi
+from dati import modifica_dati
+
+# ----------------------------------------------------------------------------
+# CHIUSURA MESI
+# ----------------------------------------------------------------------------
+def mostra(data, azienda):
+    st.title("🔒 Chiusura Mesi")
+    st.write(
+        "La chiusura congela gli incentivi calcolati del mese per tutti i dipendenti. "
+        "Report, dashboard e ristampe dei PDF di un mese chiuso leggono i valori congelati: "
+        "modifiche successive a KPI o risultati non cambiano più quel mese."
+    )
+
+    chiusi = mesi_chiusi(data)
+    if chiusi:
+        st.write("### 📋 Mesi Chiusi")
+        st.dataframe(
+            [
+                {
+                    "Mese": mese,
+                    "Chiuso il": chiusura["chiuso_il"],
+                    "Dipendenti": len(chiusura["dipendenti"]),
+                    "Totale Incentivi (EUR)": round(chiusura["totale_incentivi"], 2)
+                }
+                for mese, chiusura in sorted(chiusi.items(), reverse=True)
+            ],
+            use_container_width=True
+        )
+
+    st.write("### Chiudi un Mese")
+    aperti = mesi_aperti(data)
+    if not aperti:
+        st.info("Non ci sono mesi aperti con risultati da chiudere.")
+        return
+
+    mese = st.selectbox("📅 Mese da chiudere", aperti)
+    conferma = st.checkbox(f"Confermo la chiusura definitiva del mese {mese}")
+    if st.button("🔒 Chiudi Mese", disabled=not conferma):
+        try:
+            modifica_dati(azienda, lambda dati: chiudi_mese(dati, mese))
+        except ValueError as errore:
+            # Chiuso nel frattempo da un'altra sessione
+            st.error(f"⚠️ {errore}")
+        else:
+            st.success(f"✅ Mese {mese} chiuso con successo!")
+            st.experimental_rerun()
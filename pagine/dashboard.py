@@ -0,0 +1,334 @@
+import tempfile
+
+import streamlit as st
+
+from flusso import esporta_incentivi_csv, riepiloghi_salvati, totali_salvati
+from gruppi import (
+    costruisci_indice_ruoli,
+    rapporto_percentuale,
+    riepilogo_gruppo
+)
+
+# ----------------------------------------------------------------------------
+# NUOVA DASHBOARD AVANZATA
+# ----------------------------------------------------------------------------
+# La dashboard non carica l'archivio: lavora sui riepiloghi mensili per dipendente
+# (nome, ruolo e totali del mese, senza KPI né storici) calcolati da flusso.py leggendo
+# il file a blocchi, una volta per versione salvata e condivisi tra le sessioni.
+# Le tabelle contengono solo le righe dei dipendenti selezionati.
+# La vista per dipendente resta leggibile anche con divisioni di migliaia di persone:
+# di default sono selezionati al massimo MASSIMO_SELEZIONATI dipendenti e i grafici
+# disegnano una linea (con legenda) solo per i MASSIMO_LINEE_GRAFICO con il compenso
+# totale più alto. Con un filtro per ruolo la vista predefinita è quella per ruolo.
+
+DATI_COMPLETI = False  # riceve data=None, vedi incentivi-app2.py
+MASSIMO_SELEZIONATI = 20
+MASSIMO_LINEE_GRAFICO = 10
+
+
+def mostra(data, azienda):
+    import pandas as pd
+    import matplotlib.pyplot as plt
+
+    st.title("📊 Gestione Piano Incentivo Aziendale")
+
+    dipendenti = riepiloghi_salvati(azienda)  # condivisi: in sola lettura
+    if not dipendenti:
+        st.warning("⚠️ Nessun dipendente registrato.")
+    else:
+        # 1) FILTRO PER RUOLO (indice ruolo -> dipendenti)
+        indice_ruoli = costruisci_indice_ruoli(dipendenti)
+        ruoli_selezionati = st.multiselect("🏷️ Filtra per ruolo", list(indice_ruoli.keys()))
+
+        # 2) CAMPO DI RICERCA TESTUALE
+        search_term = st.text_input("🔎 Cerca dipendente per nome").strip().lower()
+        
+        # Filtro base: solo i dipendenti dei ruoli scelti, senza scorrere tutta l'anagrafica
+        if ruoli_selezionati:
+            candidati = [emp_id for ruolo in ruoli_selezionati for emp_id in indice_ruoli[ruolo]]
+        else:
+            candidati = dipendenti.keys()
+        filtered_employees = {
+            emp_id: dipendenti[emp_id]
+            for emp_id in candidati
+            if search_term in dipendenti[emp_id]["name"].lower()  # match parziale sul nome
+        }
+
+        # Senza key: cambiando il default con il filtro cambia anche il widget, quindi la vista
+        # passa da sola a "Per ruolo" quando si sceglie un ruolo
+        vista = st.radio("📂 Vista", ["Per dipendente", "Per ruolo"], index=1 if ruoli_selezionati else 0, horizontal=True)
+
+        if not filtered_employees:
+            st.warning("Nessun dipendente trovato con questo criterio di ricerca.")
+        elif vista == "Per ruolo":
+            mostra_per_ruolo(filtered_employees, indice_ruoli, ruoli_selezionati or list(indice_ruoli.keys()))
+        else:
+            # 3) SELEZIONE MULTIPLA DEI DIPENDENTI FILTRATI
+            selected_emp_ids = st.multiselect(
+                "Seleziona uno o più dipendenti",
+                list(filtered_employees.keys()),
+                default=list(filtered_employees.keys())[:MASSIMO_SELEZIONATI],  # selezionati di default
+                format_func=lambda x: filtered_employees[x]["name"]
+            )
+            if len(filtered_employees) > MASSIMO_SELEZIONATI:
+                st.caption(
+                    f"{len(filtered_employees)} dipendenti trovati: di default ne sono selezionati "
+                    f"{MASSIMO_SELEZIONATI}. Per i totali di gruppo usa la vista per ruolo."
+                )
+
+            # Se non ci sono dipendenti selezionati, niente da mostrare
+            if not selected_emp_ids:
+                st.info("Seleziona almeno un dipendente per visualizzare i dati.")
+            else:
+                st.write("### 📋 Riepilogo Incentivi e Stipendi")
+                riepilogo_completo = []
+                profitto_completo = []
+                mesi_globali = set()
+
+                # --------------------------------
+                # CALCOLO E COSTRUZIONE DATI
+                # --------------------------------
+                for emp_id in selected_emp_ids:
+                    emp = filtered_employees[emp_id]
+
+                    # Mesi chiusi letti dalla chiusura, mesi aperti calcolati sull'ultima versione salvata
+                    riepilogo = emp["riepilogo"]
+                    risultati_mensili_global = set(riepilogo.keys())
+
+                    # Ora costruiamo la tabella riepilogativa su tutti i mesi trovati
+                    mesi_globali = mesi_globali.union(risultati_mensili_global)
+                    for m in risultati_mensili_global:
+                        inc = riepilogo[m]["incentivi"]
+                        prof = riepilogo[m]["profitto"]
+                        stipendio = riepilogo[m]["stipendio"]
+                        ppf_mensile = riepilogo[m]["ppf"]
+                        totale_compenso = riepilogo[m]["compenso"]
+                        rapporto_totale_ppf = (totale_compenso / ppf_mensile) * 100 if ppf_mensile else 0
+
+                        riepilogo_completo.append({
+                            "Dipendente": emp["name"],
+                            "Mese": m,
+                            "Stipendio (EUR)": round(stipendio, 2),
+                            "Totale Incentivo (EUR)": round(inc, 2),
+                            "Compenso Totale (EUR)": round(totale_compenso, 2),
+                            "PPF (EUR)": round(ppf_mensile, 2),
+                            "Rapporto Compenso/PPF (%)": round(rapporto_totale_ppf, 2)
+                        })
+
+                        if prof:
+                            ratio = (prof / inc)*100 if inc > 0 else 0
+                            profitto_completo.append({
+                                "Dipendente": emp["name"],
+                                "Mese": m,
+                                "Profitto Generato (EUR)": round(prof, 2),
+                                "Incentivi Pagati (EUR)": round(inc, 2),
+                                "Rapporto Profitto/Incentivi (%)": round(ratio, 2)
+                            })
+                        else:
+                            profitto_completo.append({
+                                "Dipendente": emp["name"],
+                                "Mese": m,
+                                "Profitto Generato (EUR)": 0,
+                                "Incentivi Pagati (EUR)": round(inc, 2),
+                                "Rapporto Profitto/Incentivi (%)": 0
+                            })
+
+                # --------------------------------
+                # VISUALIZZAZIONE DATI
+                # --------------------------------
+                if riepilogo_completo:
+                    df_riepilogo = pd.DataFrame(riepilogo_completo)
+                    # Ordinamento per Mese e Dipendente
+                    df_riepilogo["Mese"] = pd.to_datetime(df_riepilogo["Mese"] + "-01")
+                    df_riepilogo = df_riepilogo.sort_values(["Mese", "Dipendente"])
+                    df_riepilogo["Mese"] = df_riepilogo["Mese"].dt.strftime("%Y-%m")
+
+                    st.dataframe(df_riepilogo, use_container_width=True)
+
+                    # Nei grafici solo i dipendenti con il compenso totale più alto
+                    nomi_grafico = (
+                        df_riepilogo.groupby("Dipendente")["Compenso Totale (EUR)"].sum()
+                        .nlargest(MASSIMO_LINEE_GRAFICO).index.tolist()
+                    )
+                    if df_riepilogo["Dipendente"].nunique() > MASSIMO_LINEE_GRAFICO:
+                        st.caption(
+                            f"Nei grafici sono mostrati i {MASSIMO_LINEE_GRAFICO} dipendenti "
+                            "con il compenso totale più alto."
+                        )
+
+                    st.write("### Grafico: Totale Compenso per Mese")
+                    fig1, ax1 = plt.subplots()
+                    # Raggruppiamo per Mese, Dipendente
+                    for dip_name in nomi_grafico:
+                        df_temp = df_riepilogo[df_riepilogo["Dipendente"] == dip_name].copy()
+                        df_temp["Mese_dt"] = pd.to_datetime(df_temp["Mese"] + "-01")
+                        df_temp = df_temp.sort_values("Mese_dt")
+
+                        ax1.plot(
+                            df_temp["Mese_dt"], 
+                            df_temp["Compenso Totale (EUR)"], 
+                            marker="o", 
+                            linestyle="-", 
+                            label=dip_name
+                        )
+                    ax1.set_xlabel("Mese")
+                    ax1.set_ylabel("Compenso Totale (EUR)")
+                    ax1.set_title("Andamento Compenso Totale")
+                    plt.xticks(rotation=45)
+                    ax1.legend()
+                    st.pyplot(fig1)
+                    plt.close(fig1)  # libera la memoria della figura
+                else:
+                    st.info("Nessun incentivo calcolato per i dipendenti selezionati.")
+
+                if profitto_completo:
+                    df_profitto = pd.DataFrame(profitto_completo)
+                    df_profitto["Mese"] = pd.to_datetime(df_profitto["Mese"] + "-01")
+                    df_profitto = df_profitto.sort_values(["Mese", "Dipendente"])
+                    df_profitto["Mese"] = df_profitto["Mese"].dt.strftime("%Y-%m")
+
+                    st.write("### Grafico: Profitto Generato vs Incentivi")
+                    st.dataframe(df_profitto, use_container_width=True)
+
+                    fig2, ax2 = plt.subplots()
+                    for dip_name in nomi_grafico:
+                        df_temp = df_profitto[df_profitto["Dipendente"] == dip_name].copy()
+                        df_temp["Mese_dt"] = pd.to_datetime(df_temp["Mese"] + "-01")
+                        df_temp = df_temp.sort_values("Mese_dt")
+
+                        ax2.plot(
+                            df_temp["Mese_dt"], 
+                            df_temp["Profitto Generato (EUR)"], 
+                            marker="o", 
+                            linestyle="-", 
+                            label=f"{dip_name} - Profitto"
+                        )
+                        ax2.plot(
+                            df_temp["Mese_dt"], 
+                            df_temp["Incentivi Pagati (EUR)"], 
+                            marker="s", 
+                            linestyle="--", 
+                            label=f"{dip_name} - Incentivi"
+                        )
+                    ax2.set_xlabel("Mese")
+                    ax2.set_ylabel("EUR")
+                    ax2.set_title("Andamento Profitto e Incentivi")
+                    plt.xticks(rotation=45)
+                    ax2.legend()
+                    st.pyplot(fig2)
+                    plt.close(fig2)  # libera la memoria della figura
+                else:
+                    st.info("Nessun profitto registrato per i dipendenti selezionati.")
+
+    mostra_totali_aziendali(azienda)
+
+
+# ----------------------------------------------------------------------------
+# VISTA PER RUOLO
+# ----------------------------------------------------------------------------
+
+def mostra_per_ruolo(filtered_employees, indice_ruoli, ruoli):
+    """
+    Totali per ruolo calcolati sommando i riepiloghi mensili dei dipendenti del gruppo:
+    i rapporti Compenso/PPF e Profitto/Incentivi sono calcolati sui totali del gruppo.
+    """
+    import pandas as pd
+    import matplotlib.pyplot as plt
+
+    riepiloghi = {emp_id: emp["riepilogo"] for emp_id, emp in filtered_employees.items()}
+
+    riepilogo_ruoli = []
+    for ruolo in ruoli:
+        emp_ids = [emp_id for emp_id in indice_ruoli.get(ruolo, []) if emp_id in riepiloghi]
+        if not emp_ids:
+            continue
+        for mese, totale in riepilogo_gruppo(riepiloghi, emp_ids).items():
+            riepilogo_ruoli.append({
+                "Ruolo": ruolo,
+                "Mese": mese,
+                "Dipendenti": totale["dipendenti"],
+                "Stipendi (EUR)": round(totale["stipendio"], 2),
+                "Totale Incentivi (EUR)": round(totale["incentivi"], 2),
+                "Compenso Totale (EUR)": round(totale["compenso"], 2),
+                "PPF (EUR)": round(totale["ppf"], 2),
+                # Solo il compenso di chi ha un PPF numerico, come il denominatore
+                "Rapporto Compenso/PPF (%)": round(rapporto_percentuale(totale["compenso_con_ppf"], totale["ppf"]), 2),
+                "Profitto Generato (EUR)": round(totale["profitto"], 2),
+                "Rapporto Profitto/Incentivi (%)": round(rapporto_percentuale(totale["profitto"], totale["incentivi"]), 2)
+            })
+
+    if not riepilogo_ruoli:
+        st.info("Nessun incentivo calcolato per i ruoli selezionati.")
+        return
+
+    st.write("### 👥 Riepilogo per Ruolo")
+    df_ruoli = pd.DataFrame(riepilogo_ruoli).sort_values(["Mese", "Ruolo"])
+    st.dataframe(df_ruoli, use_container_width=True)
+
+    # Una linea per ruolo (non per dipendente), così il grafico resta leggibile anche con migliaia di persone
+    df_ruoli["Mese_dt"] = pd.to_datetime(df_ruoli["Mese"] + "-01")
+
+    st.write("### Grafico: Compenso Totale per Ruolo")
+    fig1, ax1 = plt.subplots()
+    for ruolo, df_temp in df_ruoli.groupby("Ruolo", sort=False):
+        ax1.plot(df_temp["Mese_dt"], df_temp["Compenso Totale (EUR)"], marker="o", linestyle="-", label=ruolo)
+    ax1.set_xlabel("Mese")
+    ax1.set_ylabel("Compenso Totale (EUR)")
+    ax1.set_title("Andamento Compenso Totale per Ruolo")
+    plt.xticks(rotation=45)
+    ax1.legend()
+    st.pyplot(fig1)
+    plt.close(fig1)  # libera la memoria della figura
+
+    st.write("### Grafico: Profitto Generato vs Incentivi per Ruolo")
+    fig2, ax2 = plt.subplots()
+    for ruolo, df_temp in df_ruoli.groupby("Ruolo", sort=False):
+        ax2.plot(df_temp["Mese_dt"], df_temp["Profitto Generato (EUR)"], marker="o", linestyle="-", label=f"{ruolo} - Profitto")
+        ax2.plot(df_temp["Mese_dt"], df_temp["Totale Incentivi (EUR)"], marker="s", linestyle="--", label=f"{ruolo} - Incentivi")
+    ax2.set_xlabel("Mese")
+    ax2.set_ylabel("EUR")
+    ax2.set_title("Andamento Profitto e Incentivi per Ruolo")
+    plt.xticks(rotation=45)
+    ax2.legend()
+    st.pyplot(fig2)
+    plt.close(fig2)  # libera la memoria della figura
+
+
+# ----------------------------------------------------------------------------
+# TOTALI AZIENDALI ED EXPORT
+# ----------------------------------------------------------------------------
+
+def mostra_totali_aziendali(azienda):
+    """
+    Totali mensili di tutta l'azienda (anche dei dipendenti eliminati, per i mesi chiusi)
+    ed export CSV per mese, dipendente e KPI, entrambi calcolati leggendo l'archivio a blocchi.
+    """
+    with st.expander("🏢 Totali Aziendali ed Export"):
+        totali = totali_salvati(azienda)
+        if not totali:
+            st.info("Nessun incentivo calcolato per questa azienda.")
+        else:
+            st.dataframe(
+                [
+                    {
+                        "Mese": mese,
+                        "Dipendenti": totale["dipendenti"],
+                        "Stipendi (EUR)": round(totale["stipendio"], 2),
+                        "Totale Incentivi (EUR)": round(totale["incentivi"], 2),
+                        "Compenso Totale (EUR)": round(totale["compenso"], 2),
+                        "Rapporto Compenso/PPF (%)": round(rapporto_percentuale(totale["compenso_con_ppf"], totale["ppf"]), 2),
+                        "Profitto Generato (EUR)": round(totale["profitto"], 2),
+                        "Rapporto Profitto/Incentivi (%)": round(rapporto_percentuale(totale["profitto"], totale["incentivi"]), 2)
+                    }
+                    for mese, totale in sorted(totali.items())
+                ],
+                use_container_width=True
+            )
+
+        if st.button("Prepara Export CSV"):
+            # File temporaneo proprio di questa esecuzione, eliminato alla chiusura
+            with tempfile.TemporaryFile("w+", newline="") as file:
+                righe = esporta_incentivi_csv(azienda, file)
+                file.seek(0)
+                st.success(f"✅ {righe} righe esportate.")
+                st.download_button("📥 Scarica CSV Incentivi", file.read(), file_name=f"Incentivi_{azienda}.csv")
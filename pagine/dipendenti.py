@@ -0,0 +1,48 @@
+import streamlit as st
+
+from chiusure import nuovo_id_dipendente
+from dati import modifica_dati
+
+# ----------------------------------------------------------------------------
+# GESTIONE DIPENDENTI
+# ----------------------------------------------------------------------------
+def mostra(data, azienda):
+    st.title("Gestione Dipendenti")
+    emp_name = st.text_input("Nome del Dipendente")
+    salario_mensile = st.number_input("Salario Mensile (EUR)", min_value=0.0, step=100.0, value=0.0)
+    ruolo = st.text_input("Ruolo")
+    ppf = st.text_area("Obiettivi Personali (PPF)")
+
+    if st.button("Aggiungi Dipendente") and emp_name:
+        def aggiungi(dati):
+            emp_id = nuovo_id_dipendente(dati)
+            dati["employees"][emp_id] = {
+                "name": emp_name,
+                "salario_mensile": salario_mensile,
+                "ruolo": ruolo,
+                "ppf": ppf,
+                "kpis": {}
+            }
+
+        modifica_dati(azienda, aggiungi)
+        st.success("✅ Dati salvati con successo!")
+        st.experimental_rerun()
+
+    for emp_id, emp in data["employees"].items():
+        with st.expander(f"{emp['name']}"):
+            new_name = st.text_input("Nome", emp["name"], key=f"name_{emp_id}")
+            new_salario = st.number_input("Salario Mensile (EUR)", min_value=0.0, step=100.0, value=emp.get("salario_mensile", 0.0), key=f"salario_{emp_id}")
+            new_ruolo = st.text_input("Ruolo", emp.get("ruolo", ""), key=f"ruolo_{emp_id}")
+            new_ppf = st.text_area("Obiettivi Personali (PPF)", emp.get("ppf", ""), key=f"ppf_{emp_id}")
+
+            if st.button("Salva", key=f"save_{emp_id}"):
+                modifica_dati(azienda, lambda dati: dati["employees"][emp_id].update(
+                    {"name": new_name, "salario_mensile": new_salario, "ruolo": new_ruolo, "ppf": new_ppf}
+                ))
+                st.success("✅ Dati salvati con successo!")
+                st.experimental_rerun()
+
+            if st.button("Elimina", key=f"del_{emp_id}"):
+                modifica_dati(azienda, lambda dati: dati["employees"].pop(emp_id, None))
+                st.success("✅ Dipendente eliminato con successo!")
+                st.experimental_rerun()
@@ -0,0 +1,201 @@
+import streamlit as st
+
+from calcolo import TIPI_INCENTIVO
+from chiusure import mesi_chiusi_modificati
+from dati import modifica_dati
+
+# ----------------------------------------------------------------------------
+# GESTIONE KPI
+# ----------------------------------------------------------------------------
+def mostra(data, azienda):
+    st.title("⚙️ Gestione KPI")
+
+    emp_list = list(data["employees"].keys())
+    if emp_list:
+        selected_emp = st.selectbox(
+            "👤 Seleziona Dipendente", 
+            emp_list, 
+            format_func=lambda x: data["employees"].get(x, {}).get("name", "Sconosciuto")
+        )
+        emp = data["employees"].get(selected_emp, {})
+        
+        if "kpis" not in emp:
+            emp["kpis"] = {}
+
+        st.subheader(f"📊 Gestione KPI per {emp.get('name', 'Sconosciuto')}")
+
+        kpi_updates = []
+
+        for kpi_name, kpi_details in emp["kpis"].items():
+            with st.expander(f"⚙️ KPI: {kpi_name}"):
+                opzioni_incentivo = TIPI_INCENTIVO
+
+                incentive_type = st.selectbox(
+                    "📌 Tipo di Incentivo",
+                    opzioni_incentivo,
+                    index=opzioni_incentivo.index(kpi_details.get("incentive_type", "Importo fisso")),
+                    key=f"incentivo_{kpi_name}"
+                )
+
+                risultato_minimo = st.number_input(
+                    "📊 Risultato minimo per attivare l'incentivo",
+                    min_value=0.0,
+                    step=1.0,
+                    value=float(kpi_details.get("risultato_minimo", 0)),
+                    key=f"risultato_minimo_{kpi_name}"
+                )
+
+                premio = st.number_input(
+                    "💰 Valore Incentivo (o percentuale)",
+                    min_value=0.0,
+                    step=10.0,
+                    value=float(kpi_details.get("premio", 0)),
+                    key=f"premio_{kpi_name}"
+                )
+
+                usa_scaglioni = st.checkbox(
+                    "📈 Attiva gestione a scaglioni",
+                    value=bool(kpi_details.get("scaglioni", [])),
+                    key=f"scaglioni_{kpi_name}"
+                )
+
+                scaglioni_modificati = []
+                if usa_scaglioni:
+                    num_scaglioni = st.number_input(
+                        "📊 Numero di Scaglioni",
+                        min_value=1,
+                        step=1,
+                        value=max(1, len(kpi_details.get("scaglioni", []))),
+                        key=f"num_scaglioni_{kpi_name}"
+                    )
+                    scaglioni_correnti = list(kpi_details.get("scaglioni", []))
+                    if len(scaglioni_correnti) < num_scaglioni:
+                        scaglioni_correnti += [(0, 0, 0)] * (num_scaglioni - len(scaglioni_correnti))
+                    scaglioni_correnti = scaglioni_correnti[:num_scaglioni]
+
+                    for i in range(num_scaglioni):
+                        col1, col2, col3 = st.columns(3)
+
+                        soglia = col1.number_input(
+                            f"Soglia {i+1}", 
+                            min_value=0.0, 
+                            step=1.0,
+                            value=float(scaglioni_correnti[i][0]),
+                            key=f"soglia_{kpi_name}_{i}"
+                        )
+
+                        premio_scaglione = col2.number_input(
+                            f"Premio {i+1}", 
+                            min_value=0.0, 
+                            step=1.0,
+                            value=float(scaglioni_correnti[i][1]),
+                            key=f"premio_scaglione_{kpi_name}_{i}"
+                        )
+
+                        incentivo_scaglione = col3.number_input(
+                            f"Incentivo {i+1} (%)", 
+                            min_value=0.0, 
+                            step=1.0,
+                            value=float(scaglioni_correnti[i][2]),
+                            key=f"incentivo_scaglione_{kpi_name}_{i}"
+                        )
+
+                        scaglioni_modificati.append((soglia, premio_scaglione, incentivo_scaglione))
+
+                # Elimina KPI: non se ha risultati in mesi chiusi
+                mesi_bloccati = mesi_chiusi_modificati(data, kpi_details.get("storico_risultati", []), [])
+                if mesi_bloccati:
+                    st.info(f"🔒 {kpi_name} ha risultati nei mesi chiusi {', '.join(mesi_bloccati)}: non si può eliminare.")
+
+                if st.button(f"❌ Elimina KPI {kpi_name}", key=f"del_kpi_{kpi_name}", disabled=bool(mesi_bloccati)):
+                    def elimina_kpi(dati):
+                        kpis = dati["employees"][selected_emp]["kpis"]
+                        # Ricontrollo sui dati salvati, per un mese chiuso nel frattempo
+                        bloccati = mesi_chiusi_modificati(dati, kpis.get(kpi_name, {}).get("storico_risultati", []), [])
+                        if bloccati:
+                            raise ValueError(f"Mesi chiusi: {', '.join(bloccati)}. I loro risultati non si possono eliminare.")
+                        kpis.pop(kpi_name, None)
+
+                    try:
+                        modifica_dati(azienda, elimina_kpi)
+                    except ValueError as errore:
+                        st.error(f"🔒 {errore}")
+                    else:
+                        st.success(f"✅ KPI {kpi_name} eliminato con successo!")
+                        st.experimental_rerun()
+
+                # Salva Modifiche
+                if st.button("✅ Salva Modifiche", key=f"save_kpi_{kpi_name}"):
+                    def salva_kpi(dati):
+                        kpis = dati["employees"][selected_emp].setdefault("kpis", {})
+                        kpis[kpi_name] = {
+                            "incentive_type": incentive_type,
+                            "risultato_minimo": risultato_minimo,
+                            "premio": premio,
+                            "scaglioni": scaglioni_modificati if usa_scaglioni else [],
+                            # Lo storico resta quello salvato: qui si modificano solo le regole
+                            "storico_risultati": kpis.get(kpi_name, {}).get("storico_risultati", [])
+                        }
+
+                    modifica_dati(azienda, salva_kpi)
+
+                    kpi_updates.append({
+                        "KPI": kpi_name,
+                        "Tipo Incentivo": incentive_type,
+                        "Risultato Minimo": risultato_minimo,
+                        "Premio": premio,
+                        "Scaglioni Attivi": "Sì" if usa_scaglioni else "No",
+                        "Numero Scaglioni": len(scaglioni_modificati) if usa_scaglioni else 0
+                    })
+
+                    st.success(f"✅ Modifiche salvate per {kpi_name}!")
+                    st.experimental_rerun()
+
+        if kpi_updates:
+            import pandas as pd
+
+            st.write("### 📋 Modifiche Salvate nei KPI")
+            df_updates = pd.DataFrame(kpi_updates)
+            st.dataframe(df_updates, use_container_width=True)
+
+        # Sezione per creare un nuovo KPI
+        st.subheader("Aggiungi Nuovo KPI")
+        new_kpi_name = st.text_input("Nome KPI")
+
+        new_incentive_type = st.selectbox(
+            "Tipo di Incentivo",
+            ["Importo fisso", "% sul risultato", "% sul salario mensile", "Importo fisso x risultato"],
+            key="new_incentive_type"
+        )
+
+        new_risultato_minimo = st.number_input(
+            "Risultato Minimo",
+            min_value=0.0,
+            step=1.0,
+            key="new_risultato_minimo"
+        )
+
+        new_premio = st.number_input("Valore Incentivo (o %)", min_value=0.0, step=10.0, key="new_premio")
+
+        usa_scaglioni_new = st.checkbox("Attiva gestione a scaglioni", key="scaglioni_new")
+        new_scaglioni = []
+        if usa_scaglioni_new:
+            num_scaglioni_new = st.number_input("Numero di Scaglioni", min_value=1, step=1, key="num_scaglioni_new")
+            for i in range(num_scaglioni_new):
+                col1, col2 = st.columns(2)
+                soglia = col1.number_input(f"Soglia {i+1}", min_value=0.0, step=1.0, key=f"soglia_new_{i}")
+                premio_scaglione = col2.number_input(f"Premio {i+1}", min_value=0.0, step=1.0, key=f"premio_scaglione_new_{i}")
+                new_scaglioni.append((soglia, premio_scaglione, 0))  # Se vuoi anche la % puoi aggiungere un terzo input
+
+        if st.button("Aggiungi KPI") and new_kpi_name:
+            def aggiungi_kpi(dati):
+                dati["employees"][selected_emp].setdefault("kpis", {})[new_kpi_name] = {
+                    "incentive_type": new_incentive_type,
+                    "risultato_minimo": new_risultato_minimo,
+                    "premio": new_premio,
+                    "scaglioni": new_scaglioni if usa_scaglioni_new else []
+                }
+
+            modifica_dati(azienda, aggiungi_kpi)
+            st.success("✅ KPI aggiunto con successo!")
+            st.experimental_rerun()
@@ -0,0 +1,74 @@
+import streamlit as st
+
+from chiusure import foto_dipendente, incentivi_dipendente, mese_chiuso
+from grafici import grafici_dipendente
+from report_pdf import genera_pdf_report_mensile_singolo_dipendente
+
+#  ----------------------------------------------------------------------------
+# PAGINA: REPORT E ANALISI
+# ----------------------------------------------------------------------------
+
+def mostra(data, azienda):
+    st.title("📊 Report e Analisi Incentivi Mensili")
+
+    selected_emp = st.selectbox(
+        "👤 Seleziona Dipendente", 
+        list(data["employees"].keys()), 
+        format_func=lambda x: data["employees"].get(x, {}).get("name", "Sconosciuto")
+    )
+    emp = data["employees"].get(selected_emp, {})
+
+    if "kpis" not in emp:
+        emp["kpis"] = {}
+
+    if emp:
+        # Calcoliamo gli incentivi dei mesi aperti; i mesi chiusi arrivano dalla chiusura
+        incentivi_mensili = incentivi_dipendente(data, selected_emp, emp)
+
+        # Mostriamo i risultati in ordine dal mese più recente al più vecchio
+        if incentivi_mensili:
+            st.write("### 📆 Incentivi Mensili per KPI")
+            mesi_ordinati = sorted(incentivi_mensili.keys(), reverse=True)
+
+            for mese in mesi_ordinati:
+                kpi_data = incentivi_mensili[mese]
+                totale_incentivi_mese = sum(info["totale"] for info in kpi_data.values() if isinstance(info, dict))
+                stato_mese = "  🔒 chiuso" if mese_chiuso(data, mese) else ""
+                st.subheader(f"📅 Mese: {mese}  (Totale Incentivi = {round(totale_incentivi_mese,2)} EUR){stato_mese}")
+
+                for kpi_name, info in kpi_data.items():
+                    with st.expander(f"📊 KPI: {kpi_name} - Incentivo Totale: {info['totale']} EUR"):
+                        st.write(f"**Valore Totale Raggiunto:** {info['valore_raggiunto']}")
+                        st.write("### 🔍 Dettaglio Calcolo:")
+                        st.write(info["dettaglio"])
+
+        # Dopo aver calcolato "incentivi_mensili" e prima della sezione che mostra i grafici:
+        st.write("## Genera Riepilogo Mensile in PDF")
+
+        # Ricaviamo la lista dei mesi con dati (es. 2023-07, 2023-08, ...)
+        all_months = sorted(incentivi_mensili.keys())
+        if all_months:
+            selected_month = st.selectbox("Scegli il mese per generare il PDF", all_months)
+            includi_grafici = st.checkbox("📈 Includi i grafici KPI nel PDF")
+
+            if st.button("Genera Riepilogo Mensile PDF"):
+                # I grafici sono gli stessi mostrati sotto: presi dalla cache, non ridisegnati
+                grafici = grafici_dipendente(azienda, selected_emp, emp, incentivi_mensili) if includi_grafici else None
+                # Ristampa di un mese chiuso: nome, stipendio e PPF sono quelli congelati
+                emp_pdf = foto_dipendente(data, selected_emp, selected_month) or emp
+                pdf = genera_pdf_report_mensile_singolo_dipendente(emp_pdf, selected_month, incentivi_mensili, grafici)
+                pdf_filename = f"Riepilogo_{emp['name']}_{selected_month}.pdf"
+                pdf.output(pdf_filename)
+        
+                with open(pdf_filename, "rb") as f:
+                    st.download_button("📥 Scarica PDF del Riepilogo Mensile", f, file_name=pdf_filename)
+        else:
+            st.info("Non ci sono mesi disponibili per generare il PDF in questo momento.")
+
+        # Grafici KPI (immagini in cache per dipendente, KPI e versione dei dati)
+        if incentivi_mensili:
+            st.write("### 📈 Andamento Incentivi e Risultati per KPI")
+            for png in grafici_dipendente(azienda, selected_emp, emp, incentivi_mensili).values():
+                st.image(png, use_column_width=True)
+        else:
+            st.warning("⚠️ Nessun incentivo calcolato per questo dipendente.")
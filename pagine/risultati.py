@@ -0,0 +1,238 @@
+import csv
+import io
+from datetime import date
+
+import streamlit as st
+
+from anomalie import verifica_importazione, verifica_risultato
+from chiusure import mese_chiuso, mesi_chiusi_modificati
+from dati import aggiungi_risultati, firma_dati, modifica_dati, statistiche_risultati
+
+# ----------------------------------------------------------------------------
+# INSERIMENTO RISULTATI
+# ----------------------------------------------------------------------------
+def mostra(data, azienda):
+    st.title("📅 Inserimento Risultati KPI")
+
+    selected_emp = st.selectbox(
+        "👤 Seleziona Dipendente", 
+        list(data["employees"].keys()), 
+        format_func=lambda x: data["employees"].get(x, {}).get("name", "Sconosciuto")
+    )
+    emp = data["employees"].get(selected_emp, {})
+
+    if "kpis" not in emp:
+        emp["kpis"] = {}
+
+    if emp:
+        kpi_list = list(emp["kpis"].keys())
+        if kpi_list:
+            selected_kpi = st.selectbox("📊 Seleziona KPI", kpi_list)
+
+            data_risultato = st.date_input("📆 Data")
+            # Senza valore iniziale: il controllo anomalie parte solo da un valore inserito
+            valore_raggiunto = st.number_input("📊 Risultato ottenuto", min_value=0.0, step=1.0, value=None)
+
+            kpi_details = emp["kpis"][selected_kpi]
+            if "storico_risultati" not in kpi_details:
+                kpi_details["storico_risultati"] = []
+            
+            date_list = [r["data"] for r in kpi_details["storico_risultati"]]
+
+            # Controllo anomalie rispetto allo storico di questo KPI (es. uno zero di troppo)
+            anomalia = None
+            if valore_raggiunto is not None:
+                anomalia = verifica_risultato(statistiche_risultati(azienda), (selected_emp, selected_kpi), valore_raggiunto)
+
+            if mese_chiuso(data, str(data_risultato)[:7]):
+                st.warning(f"🔒 Il mese {str(data_risultato)[:7]} è chiuso: non è possibile aggiungere risultati.")
+            elif str(data_risultato) in date_list:
+                st.warning("⚠️ Esiste già un valore per questa data. Modifica il valore nella tabella sottostante.")
+            else:
+                conferma = valore_raggiunto is not None
+                if anomalia:
+                    st.warning(f"⚠️ {anomalia} Controlla che non sia un errore di inserimento.")
+                    # Una conferma vale solo per questo dipendente, KPI, data e valore
+                    conferma = st.checkbox(
+                        "Confermo che il valore è corretto",
+                        key=f"conferma_anomalia_{selected_emp}_{selected_kpi}_{data_risultato}_{valore_raggiunto}"
+                    )
+
+                if st.button("✅ Salva Risultato", disabled=not conferma):
+                    aggiungi_risultati(azienda, [(selected_emp, selected_kpi, str(data_risultato), valore_raggiunto)])
+                    st.success(f"✅ Risultato per **{selected_kpi}** salvato con successo!")
+                    st.experimental_rerun()
+
+            if "storico_risultati" in kpi_details and kpi_details["storico_risultati"]:
+                import pandas as pd
+
+                st.write("### 📋 Riepilogo Risultati")
+                df = pd.DataFrame(kpi_details["storico_risultati"])
+                df["data"] = pd.to_datetime(df["data"])
+                df = df.sort_values("data", ascending=False)
+
+                # Se la tua versione di Streamlit NON supporta st.data_editor(), sostituisci con st.dataframe()
+                edited_df = st.data_editor(df, num_rows="dynamic", use_container_width=True)
+
+                if not df.equals(edited_df):
+                    # Date di nuovo come testo YYYY-MM-DD: i Timestamp di pandas non vanno in JSON
+                    edited_df["data"] = pd.to_datetime(edited_df["data"]).dt.strftime("%Y-%m-%d")
+                    nuovo_storico = edited_df.dropna(subset=["data"]).to_dict(orient="records")
+
+                    # Righe modificate o aggiunte: stesso controllo anomalie dell'inserimento singolo
+                    righe_nuove = righe_modificate(kpi_details["storico_risultati"], nuovo_storico)
+                    anomalie = verifica_importazione(
+                        statistiche_risultati(azienda),
+                        [(selected_emp, selected_kpi, r["data"], r["valore_raggiunto"]) for r in righe_nuove]
+                    )
+                    conferma = True
+                    if anomalie:
+                        for indice, messaggio in anomalie:
+                            st.warning(f"⚠️ {righe_nuove[indice]['data']}: {messaggio} Controlla che non sia un errore di inserimento.")
+                        # La conferma vale solo per queste righe con questi valori
+                        conferma = st.checkbox(
+                            "Confermo che i valori modificati sono corretti",
+                            key=f"conferma_tabella_{selected_emp}_{selected_kpi}_{hash(tuple(sorted((r['data'], r['valore_raggiunto']) for r in righe_nuove)))}"
+                        )
+
+                    def aggiorna_storico(dati):
+                        kpi = dati["employees"][selected_emp]["kpis"][selected_kpi]
+                        verifica_mesi_aperti(dati, kpi.get("storico_risultati", []), nuovo_storico)
+                        kpi["storico_risultati"] = nuovo_storico
+
+                    if not conferma:
+                        st.info("Modifiche non salvate: conferma i valori anomali o correggili nella tabella.")
+                    else:
+                        try:
+                            modifica_dati(azienda, aggiorna_storico)
+                        except ValueError as errore:
+                            st.error(f"🔒 {errore} Annulla le modifiche a quelle righe nella tabella.")
+                        else:
+                            st.success("✅ Modifiche salvate con successo!")
+                            st.experimental_rerun()
+
+                st.write("### ❌ Elimina un Risultato")
+                selected_index = st.selectbox("Seleziona la data da eliminare", df["data"].astype(str).tolist())
+                if mese_chiuso(data, selected_index[:7]):
+                    st.info(f"🔒 Il mese {selected_index[:7]} è chiuso: il risultato non si può eliminare.")
+
+                if st.button("❌ Elimina Risultato", disabled=mese_chiuso(data, selected_index[:7])):
+                    def elimina(dati):
+                        kpi = dati["employees"][selected_emp]["kpis"][selected_kpi]
+                        storico = kpi.get("storico_risultati", [])
+                        nuovo_storico = [r for r in storico if str(r["data"]) != selected_index]
+                        verifica_mesi_aperti(dati, storico, nuovo_storico)
+                        kpi["storico_risultati"] = nuovo_storico
+
+                    try:
+                        modifica_dati(azienda, elimina)
+                    except ValueError as errore:
+                        st.error(f"🔒 {errore}")
+                    else:
+                        st.success("✅ Risultato eliminato con successo!")
+                        st.experimental_rerun()
+        else:
+            st.warning("⚠️ Nessun KPI assegnato a questo dipendente.")
+
+    importa_risultati(data, azienda)
+
+
+def verifica_mesi_aperti(data, storico_prima, storico_dopo):
+    """
+    ValueError se la modifica dello storico tocca risultati di mesi chiusi.
+    Chiamata dentro modifica_dati, così vale anche per un mese chiuso nel frattempo.
+    """
+    bloccati = mesi_chiusi_modificati(data, storico_prima, storico_dopo)
+    if bloccati:
+        raise ValueError(f"Mesi chiusi: {', '.join(bloccati)}. I loro risultati non si possono modificare.")
+
+
+def righe_modificate(storico_prima, storico_dopo):
+    """
+    Righe di 'storico_dopo' che non erano in 'storico_prima' con la stessa data e lo stesso valore.
+    """
+    presenti = {(str(r["data"]), r["valore_raggiunto"]) for r in storico_prima}
+    return [r for r in storico_dopo if (str(r["data"]), r["valore_raggiunto"]) not in presenti]
+
+
+def leggi_righe_importazione(data, file_csv):
+    """
+    Legge un CSV con colonne emp_id, kpi, data, valore_raggiunto.
+    Restituisce (righe valide come (emp_id, kpi, data, valore), numero di righe scartate).
+    Sono scartate le righe con dipendente o KPI sconosciuti, data o valore non validi,
+    le date dei mesi chiusi e quelle già presenti nello storico del KPI (o ripetute nel file).
+    """
+    righe = []
+    scartate = 0
+    date_esistenti = {}
+
+    for riga in csv.DictReader(io.StringIO(file_csv.getvalue().decode("utf-8-sig"))):
+        try:
+            emp_id = riga["emp_id"].strip()
+            kpi_name = riga["kpi"].strip()
+            data_risultato = date.fromisoformat(riga["data"].strip()).isoformat()
+            valore = float(riga["valore_raggiunto"])
+            kpi_details = data["employees"][emp_id]["kpis"][kpi_name]
+        except (KeyError, TypeError, ValueError, AttributeError):
+            scartate += 1
+            continue
+
+        chiave = (emp_id, kpi_name)
+        if chiave not in date_esistenti:
+            date_esistenti[chiave] = {r["data"] for r in kpi_details.get("storico_risultati", [])}
+        if valore < 0 or data_risultato in date_esistenti[chiave] or mese_chiuso(data, data_risultato[:7]):
+            scartate += 1
+            continue
+        date_esistenti[chiave].add(data_risultato)
+        righe.append((emp_id, kpi_name, data_risultato, valore))
+
+    return righe, scartate
+
+
+def importa_risultati(data, azienda):
+    st.write("### 📥 Importa Risultati da CSV")
+    file_csv = st.file_uploader(
+        "Carica un file CSV con colonne: emp_id, kpi, data (YYYY-MM-DD), valore_raggiunto",
+        type="csv"
+    )
+    if file_csv is None:
+        return
+
+    # Lettura e controllo del file solo quando cambiano il file o i dati salvati,
+    # non a ogni interazione con la pagina
+    chiave = (file_csv.file_id, azienda, firma_dati(azienda))
+    controllo = st.session_state.get("controllo_importazione")
+    if controllo is None or controllo[0] != chiave:
+        righe, scartate = leggi_righe_importazione(data, file_csv)
+        anomalie = verifica_importazione(statistiche_risultati(azienda), righe)
+        controllo = st.session_state["controllo_importazione"] = (chiave, righe, scartate, anomalie)
+    _, righe, scartate, anomalie = controllo
+    st.write(f"Righe valide: **{len(righe)}** — scartate: **{scartate}** — anomale: **{len(anomalie)}**")
+
+    includi_anomale = False
+    if anomalie:
+        st.warning("⚠️ Alcuni valori sono molto diversi dallo storico del dipendente per quel KPI.")
+        st.dataframe(
+            [
+                {
+                    "Riga": indice + 1,
+                    "Dipendente": data["employees"][righe[indice][0]]["name"],
+                    "KPI": righe[indice][1],
+                    "Data": righe[indice][2],
+                    "Valore": righe[indice][3],
+                    "Motivo": messaggio
+                }
+                for indice, messaggio in anomalie
+            ],
+            use_container_width=True
+        )
+        includi_anomale = st.checkbox("Importa anche i valori anomali")
+
+    if righe and st.button("📥 Importa Risultati"):
+        indici_anomali = {indice for indice, _ in anomalie}
+        da_importare = [
+            riga for indice, riga in enumerate(righe)
+            if includi_anomale or indice not in indici_anomali
+        ]
+        aggiungi_risultati(azienda, da_importare)
+        st.success(f"✅ {len(da_importare)} risultati importati con successo!")
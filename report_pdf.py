@@ -0,0 +1,186 @@
+from datetime import datetime
+
+from gruppi import valore_ppf
+
+# ----------------------------------------------------------------------------
+# UTILS PER PDF
+# ----------------------------------------------------------------------------
+# fpdf viene importato dentro le funzioni: serve solo quando si genera un PDF.
+
+def genera_scheda_dipendente_pdf(emp, incentivi_mensili):
+    from fpdf import FPDF
+
+    pdf = FPDF()
+    pdf.set_auto_page_break(auto=True, margin=15)
+    pdf.add_page()
+    pdf.set_font("Arial", "B", 16)
+
+    pdf.cell(200, 10, "Scheda Dipendente", ln=True, align="C")
+    pdf.ln(10)
+    pdf.set_font("Arial", "", 12)
+    pdf.cell(200, 10, f"Nome: {emp['name']}", ln=True)
+    pdf.cell(200, 10, f"Data Stampa: {datetime.today().strftime('%Y-%m-%d')}", ln=True)
+    pdf.ln(10)
+
+    pdf.set_font("Arial", "B", 14)
+    pdf.cell(200, 10, "Dettagli KPI", ln=True)
+    pdf.ln(5)
+    
+    pdf.set_font("Arial", "", 12)
+    for kpi_name, kpi_details in emp.get("kpis", {}).items():
+        pdf.cell(200, 8, f"KPI: {kpi_name}", ln=True)
+        pdf.cell(200, 8, f"Tipo Incentivo: {kpi_details.get('incentive_type', 'N/A')}", ln=True)
+        pdf.cell(200, 8, f"Risultato Minimo: {kpi_details.get('risultato_minimo', 'N/A')}", ln=True)
+        pdf.cell(200, 8, f"Premio: {kpi_details.get('premio', 'N/A')} EUR", ln=True)
+        pdf.ln(5)
+
+    pdf.set_font("Arial", "B", 14)
+    pdf.cell(200, 10, "Risultati Inseriti", ln=True)
+    pdf.ln(5)
+
+    pdf.set_font("Arial", "", 12)
+    for kpi_name, kpi_details in emp.get("kpis", {}).items():
+        if "storico_risultati" in kpi_details:
+            pdf.cell(200, 8, f"KPI: {kpi_name}", ln=True)
+            for entry in kpi_details["storico_risultati"]:
+                pdf.cell(200, 8, f"  - Data: {entry['data']} | Valore: {entry['valore_raggiunto']}", ln=True)
+            pdf.ln(5)
+
+    return pdf
+
+def genera_riassunto_mensile_pdf(emp, incentivi_mensili):
+    from fpdf import FPDF
+
+    pdf = FPDF()
+    pdf.set_auto_page_break(auto=True, margin=15)
+    pdf.add_page()
+    pdf.set_font("Arial", "B", 16)
+
+    pdf.cell(200, 10, "Riepilogo Incentivi Mensili", ln=True, align="C")
+    pdf.ln(10)
+    pdf.set_font("Arial", "", 12)
+    pdf.cell(200, 10, f"Nome: {emp['name']}", ln=True)
+    pdf.cell(200, 10, f"Data Stampa: {datetime.today().strftime('%Y-%m-%d')}", ln=True)
+    pdf.ln(10)
+
+    pdf.set_font("Arial", "B", 14)
+    pdf.cell(200, 10, "Incentivi Maturati", ln=True)
+    pdf.ln(5)
+    
+    pdf.set_font("Arial", "", 12)
+    for mese, dati in incentivi_mensili.items():
+        pdf.cell(200, 8, f"Mese: {mese}", ln=True)
+        for kpi_name, info in dati.items():
+            if isinstance(info, dict):
+                pdf.cell(200, 8, f"  - KPI: {kpi_name} | Incentivo: {info.get('totale', 0)} EUR | Risultato: {info.get('valore_raggiunto', 0)}", ln=True)
+            else:
+                pdf.cell(200, 8, f"  - KPI: {kpi_name} | Incentivo: 0 EUR | Risultato: 0", ln=True)
+        pdf.ln(5)
+
+    return pdf
+
+def genera_pdf_report_mensile_singolo_dipendente(emp, mese, incentivi_mensili, grafici=None):
+    """
+    Genera un PDF professionale per il singolo dipendente 'emp' relativo al mese 'mese',
+    con i dati presi da 'incentivi_mensili[mese]'.
+    Riepiloga: stipendio, incentivi totali, % PPF (se impostato), testo introduttivo e conclusivo.
+    Se 'grafici' ({kpi_name: PNG}, vedi grafici.grafici_dipendente) è indicato, aggiunge
+    l'andamento dei KPI del mese usando le immagini già disegnate.
+    """
+    from fpdf import FPDF
+    
+    # Recupero dati principali
+    nome_dipendente = emp.get("name", "Dipendente Sconosciuto")
+    stipendio_base = float(emp.get("salario_mensile", 0))
+    ppf = valore_ppf(emp)  # 0 se vuoto o testo libero: la percentuale PPF non viene stampata
+    
+    # Incentivi totali di questo mese
+    dettagli_mese = incentivi_mensili.get(mese, {})
+    
+    # Somma di tutti i KPI di questo mese
+    incentivo_mese = 0
+    for kpi_name, info in dettagli_mese.items():
+        if isinstance(info, dict):
+            incentivo_mese += info.get("totale", 0)
+    
+    # Calcolo del totale compenso
+    compenso_totale = stipendio_base + incentivo_mese
+    
+    # Calcolo % raggiungimento PPF se > 0
+    percent_ppf = 0
+    if ppf > 0:
+        percent_ppf = (compenso_totale / ppf) * 100
+    
+    # Creiamo il PDF
+    pdf = FPDF()
+    pdf.set_auto_page_break(auto=True, margin=15)
+    pdf.add_page()
+    
+    # Titolo
+    pdf.set_font("Arial", "B", 16)
+    pdf.cell(0, 10, f"Riepilogo Incentivi - Mese {mese}", ln=True, align="C")
+    pdf.ln(5)
+    
+    # Testo introduttivo
+    pdf.set_font("Arial", "", 12)
+    testo_intro = (
+        f"Gentile {nome_dipendente},\n\n"
+        f"Desideriamo informarla in merito ai risultati raggiunti e agli incentivi maturati "
+        f"nel corso del mese {mese}.\n"
+        "Grazie alle sue performance e al suo impegno, sono stati calcolati i seguenti importi:\n"
+    )
+    pdf.multi_cell(0, 7, testo_intro)
+    pdf.ln(3)
+    
+    # Riepilogo importi
+    pdf.set_font("Arial", "B", 12)
+    pdf.cell(0, 8, f"Stipendio base mensile: {stipendio_base:,.2f} EUR", ln=True)
+    pdf.cell(0, 8, f"Incentivi totali: {incentivo_mese:,.2f} EUR", ln=True)
+    pdf.cell(0, 8, f"Compenso totale (stipendio + incentivi): {compenso_totale:,.2f} EUR", ln=True)
+    
+    if ppf > 0:
+        pdf.cell(0, 8, f"PPF mensile: {ppf:,.2f} EUR", ln=True)
+        pdf.cell(0, 8, f"Percentuale di raggiungimento PPF: {percent_ppf:,.2f}%", ln=True)
+    
+    pdf.ln(5)
+    
+    # (Opzionale) Dettaglio KPI se vuoi elencarli
+    pdf.set_font("Arial", "B", 13)
+    pdf.cell(0, 8, "Dettaglio KPI e Incentivi:", ln=True)
+    pdf.set_font("Arial", "", 12)
+    pdf.ln(3)
+    
+    for kpi_name, info in dettagli_mese.items():
+        if isinstance(info, dict):
+            val_raggiunto = info.get("valore_raggiunto", 0)
+            inc_kpi = info.get("totale", 0)
+            pdf.multi_cell(0, 7, f"- KPI: {kpi_name}\n  Valore Raggiunto: {val_raggiunto}\n  Incentivo: {inc_kpi:,.2f} EUR")
+            pdf.ln(2)
+    
+    # (Opzionale) Grafici dei KPI del mese, dalla cache dei grafici
+    if grafici:
+        from grafici import file_grafico
+
+        kpi_con_grafico = [kpi_name for kpi_name in dettagli_mese if kpi_name in grafici]
+        if kpi_con_grafico:
+            pdf.ln(3)
+            pdf.set_font("Arial", "B", 13)
+            pdf.cell(0, 8, "Andamento KPI:", ln=True)
+            for kpi_name in kpi_con_grafico:
+                with file_grafico(grafici[kpi_name]) as percorso:
+                    pdf.image(percorso, w=170, type="PNG")
+                pdf.ln(3)
+    
+    # Conclusioni
+    pdf.ln(5)
+    pdf.set_font("Arial", "", 12)
+    testo_finale = (
+        "Siamo lieti di riconoscere il suo contributo e la invitiamo a proseguire "
+        "nell'ottica di miglioramento continuo. Per eventuali chiarimenti o suggerimenti, "
+        "restiamo a disposizione.\n\n"
+        "Cordiali saluti,\n"
+        "Ufficio Risorse Umane"
+    )
+    pdf.multi_cell(0, 7, testo_finale)
+    
+    return pdf
@@ -0,0 +1,133 @@
+# ----------------------------------------------------------------------------
+# IMPLEMENTAZIONE DI RIFERIMENTO
+# ----------------------------------------------------------------------------
+# Copia letterale delle regole di calcolo così come erano scritte nelle pagine
+# "Dashboard Avanzata" e "Report e Analisi" prima dell'introduzione di calcolo.py.
+# NON ottimizzare questo file: serve solo come termine di paragone.
+
+
+def incentivi_dashboard(emp):
+    """
+    Regole della "Dashboard Avanzata": {mese: {"totale_incentivi", "profitto"}}.
+    """
+    incentivi_mensili = {}
+
+    for kpi_name, kpi_details in emp.get("kpis", {}).items():
+        if "storico_risultati" in kpi_details:
+            # Sommiamo i risultati per mese
+            risultati_mensili = {}
+            for entry in kpi_details["storico_risultati"]:
+                mese = entry["data"][:7]
+                valore = entry["valore_raggiunto"]
+                risultati_mensili[mese] = risultati_mensili.get(mese, 0) + valore
+
+            for mese, valore_totale in risultati_mensili.items():
+                incentivo = 0
+                valore_minimo = kpi_details.get("risultato_minimo", 0)
+                profitto_generato = 0
+
+                if valore_totale >= valore_minimo:
+                    # Scaglioni
+                    if kpi_details.get("scaglioni", []):
+                        scaglioni_corretto = [
+                            (s[0], s[1], s[2] if len(s) > 2 else 0)
+                            for s in kpi_details["scaglioni"]
+                        ]
+                        for soglia, premio_scaglione, percentuale_scaglione in sorted(scaglioni_corretto, key=lambda x: x[0]):
+                            if valore_totale >= soglia:
+                                if kpi_details["incentive_type"] == "% sul risultato":
+                                    incentivo = (valore_totale * percentuale_scaglione) / 100
+                                elif kpi_details["incentive_type"] == "% sul salario mensile":
+                                    incentivo = (emp["salario_mensile"] * percentuale_scaglione) / 100
+                                elif kpi_details["incentive_type"] == "Importo fisso":
+                                    incentivo = premio_scaglione
+                                profitto_generato = valore_totale
+                    else:
+                        # Altri tipi di incentivo
+                        itype = kpi_details["incentive_type"]
+                        premio_base = kpi_details["premio"]
+                        if itype == "Importo fisso":
+                            incentivo = premio_base
+                        elif itype == "% sul risultato":
+                            incentivo = (valore_totale * premio_base) / 100
+                        elif itype == "% sul salario mensile":
+                            incentivo = (emp["salario_mensile"] * premio_base) / 100
+                        elif itype == "Importo fisso x risultato":
+                            incentivo = valore_totale * premio_base
+                        profitto_generato = valore_totale
+
+                if mese not in incentivi_mensili:
+                    incentivi_mensili[mese] = {"totale_incentivi": 0, "profitto": 0}
+
+                incentivi_mensili[mese]["totale_incentivi"] += incentivo
+                incentivi_mensili[mese]["profitto"] += profitto_generato
+
+    return incentivi_mensili
+
+
+def incentivi_report(emp):
+    """
+    Regole di "Report e Analisi": {mese: {kpi_name: {"totale", "dettaglio", "valore_raggiunto"}}}.
+    """
+    incentivi_mensili = {}
+
+    for kpi_name, kpi_details in emp.get("kpis", {}).items():
+        if "storico_risultati" in kpi_details:
+            risultati_mensili = {}
+
+            for entry in kpi_details["storico_risultati"]:
+                mese = entry["data"][:7]
+                valore = entry["valore_raggiunto"]
+
+                if mese not in risultati_mensili:
+                    risultati_mensili[mese] = 0
+                risultati_mensili[mese] += valore
+
+            for mese, valore_totale in risultati_mensili.items():
+                incentivo = 0
+                calcolo_dettagliato = []
+                valore_minimo = kpi_details.get("risultato_minimo", 0)
+
+                if valore_totale >= valore_minimo:
+                    if kpi_details.get("scaglioni", []):
+                        scaglioni_corretto = [
+                            (s[0], s[1], s[2] if len(s) > 2 else 0)
+                            for s in kpi_details["scaglioni"]
+                        ]
+                        for soglia, premio_scaglione, percentuale_scaglione in sorted(scaglioni_corretto, key=lambda x: x[0]):
+                            if valore_totale >= soglia:
+                                if kpi_details["incentive_type"] == "% sul risultato":
+                                    incentivo = (valore_totale * percentuale_scaglione) / 100
+                                    calcolo_dettagliato.append(f"{valore_totale} × {percentuale_scaglione}% = {incentivo} EUR")
+                                elif kpi_details["incentive_type"] == "% sul salario mensile":
+                                    incentivo = (emp["salario_mensile"] * percentuale_scaglione) / 100
+                                    calcolo_dettagliato.append(f"{emp['salario_mensile']} × {percentuale_scaglione}% = {incentivo} EUR")
+                                elif kpi_details["incentive_type"] == "Importo fisso":
+                                    incentivo = premio_scaglione
+                                    calcolo_dettagliato.append(f"Incentivo fisso per soglia {soglia}: {incentivo} EUR")
+                    else:
+                        if kpi_details["incentive_type"] == "Importo fisso x risultato":
+                            incentivo = valore_totale * kpi_details["premio"]
+                            calcolo_dettagliato.append(f"{valore_totale} × {kpi_details['premio']} = {incentivo} EUR")
+                        elif kpi_details["incentive_type"] == "Importo fisso":
+                            incentivo = kpi_details["premio"]
+                            calcolo_dettagliato.append(f"Incentivo fisso: {incentivo} EUR")
+                        elif kpi_details["incentive_type"] == "% sul risultato":
+                            incentivo = (valore_totale * kpi_details["premio"]) / 100
+                            calcolo_dettagliato.append(f"{valore_totale} × {kpi_details['premio']}% = {incentivo} EUR")
+                        elif kpi_details["incentive_type"] == "% sul salario mensile":
+                            incentivo = (emp["salario_mensile"] * kpi_details["premio"]) / 100
+                            calcolo_dettagliato.append(f"{emp['salario_mensile']} × {kpi_details['premio']}% = {incentivo} EUR")
+                else:
+                    calcolo_dettagliato.append(f"❌ Valore sotto soglia minima {valore_minimo}, nessun incentivo.")
+
+                if mese not in incentivi_mensili:
+                    incentivi_mensili[mese] = {}
+
+                incentivi_mensili[mese][kpi_name] = {
+                    "totale": incentivo,
+                    "dettaglio": "\n".join(calcolo_dettagliato),
+                    "valore_raggiunto": valore_totale
+                }
+
+    return incentivi_mensili
@@ -0,0 +1,151 @@
+"""
+Verifica di regressione del motore di calcolo incentivi (calcolo.py).
+
+1) Casi di riferimento: confronta gli incentivi mensili con quelli attesi in
+   verifica/casi_riferimento.json.
+2) Confronto casuale: genera dipendenti/KPI/risultati casuali e verifica che
+   calcolo.py dia esattamente lo stesso risultato (importi, profitto, dettaglio)
+   dell'implementazione di riferimento in verifica/riferimento.py.
+
+Uso (dalla cartella del progetto):
+    python -m verifica.verifica_calcolo [--casuali 500] [--seed 0]
+"""
+import argparse
+import json
+import math
+import os
+import random
+import sys
+
+from calcolo import TIPI_INCENTIVO, calcola_incentivi_mensili, totali_mensili
+from verifica.riferimento import incentivi_dashboard, incentivi_report
+
+FILE_CASI = os.path.join(os.path.dirname(os.path.abspath(__file__)), "casi_riferimento.json")
+
+
+def _uguale(a, b):
+    return math.isclose(a, b, rel_tol=0, abs_tol=1e-9)
+
+
+def verifica_casi_riferimento(percorso=FILE_CASI):
+    """
+    Restituisce la lista degli errori trovati sui casi di riferimento.
+    """
+    with open(percorso, "r") as file:
+        casi = json.load(file)["casi"]
+
+    errori = []
+    for caso in casi:
+        nome = caso["descrizione"]
+        emp = caso["dipendente"]
+        incentivi = calcola_incentivi_mensili(emp)
+        totali = totali_mensili(incentivi)
+
+        ottenuto = {mese: {k: info["totale"] for k, info in kpi.items()} for mese, kpi in incentivi.items()}
+        if ottenuto.keys() != caso["atteso"].keys():
+            errori.append(f"{nome}: mesi {sorted(ottenuto)} invece di {sorted(caso['atteso'])}")
+            continue
+        for mese, kpi_attesi in caso["atteso"].items():
+            for kpi_name, atteso in kpi_attesi.items():
+                valore = ottenuto[mese].get(kpi_name)
+                if valore is None or not _uguale(valore, atteso):
+                    errori.append(f"{nome}: {mese}/{kpi_name} = {valore} invece di {atteso}")
+        for mese, atteso in caso["atteso_totali"].items():
+            for chiave in ("totale_incentivi", "profitto"):
+                if not _uguale(totali[mese][chiave], atteso[chiave]):
+                    errori.append(f"{nome}: {mese} {chiave} = {totali[mese][chiave]} invece di {atteso[chiave]}")
+
+        # I casi di riferimento devono valere anche per le regole originali
+        if totali != incentivi_dashboard(emp):
+            errori.append(f"{nome}: totali diversi dalla Dashboard di riferimento")
+    return errori
+
+
+def genera_dipendente(rng):
+    """
+    Dipendente casuale con KPI di ogni tipo, scaglioni (anche a due elementi) e storico.
+    I valori sono multipli di 0.5 come quelli inseriti dai number_input dell'app.
+    """
+    kpis = {}
+    for i in range(rng.randint(0, 4)):
+        scaglioni = []
+        if rng.random() < 0.5:
+            for _ in range(rng.randint(1, 4)):
+                soglia = rng.choice([0, 10, 50, 100, 150, 200, rng.randint(0, 400) / 2])
+                premio = rng.randint(0, 500) / 2
+                if rng.random() < 0.2:
+                    scaglioni.append([soglia, premio])
+                else:
+                    scaglioni.append([soglia, premio, rng.randint(0, 40) / 2])
+        kpi = {
+            "incentive_type": rng.choice(TIPI_INCENTIVO),
+            "risultato_minimo": rng.choice([0.0, 0.0, 10.0, 50.0, rng.randint(0, 300) / 2]),
+            "premio": rng.randint(0, 400) / 2,
+            "scaglioni": scaglioni
+        }
+        if rng.random() < 0.9:
+            kpi["storico_risultati"] = [
+                {
+                    "data": f"{rng.randint(2023, 2025)}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}",
+                    "valore_raggiunto": rng.randint(0, 600) / 2
+                }
+                for _ in range(rng.randint(0, 12))
+            ]
+        kpis[f"KPI {i}"] = kpi
+
+    return {
+        "name": f"Dipendente {rng.randint(1, 10**6)}",
+        "salario_mensile": rng.randint(0, 80) * 50.0,
+        "ruolo": "",
+        "ppf": "",
+        "kpis": kpis
+    }
+
+
+def verifica_casuale(numero_casi, seed):
+    """
+    Restituisce la lista degli errori trovati confrontando calcolo.py con il riferimento.
+    """
+    rng = random.Random(seed)
+    errori = []
+    for n in range(numero_casi):
+        emp = genera_dipendente(rng)
+
+        incentivi = calcola_incentivi_mensili(emp)
+        atteso_report = incentivi_report(emp)
+        ottenuto_report = {
+            mese: {
+                k: {"totale": info["totale"], "dettaglio": info["dettaglio"], "valore_raggiunto": info["valore_raggiunto"]}
+                for k, info in kpi.items()
+            }
+            for mese, kpi in incentivi.items()
+        }
+        if ottenuto_report != atteso_report:
+            errori.append(f"caso casuale {n} (seed {seed}): differenze con Report e Analisi\n{json.dumps(emp)}")
+
+        if totali_mensili(incentivi) != incentivi_dashboard(emp):
+            errori.append(f"caso casuale {n} (seed {seed}): differenze con Dashboard Avanzata\n{json.dumps(emp)}")
+
+        if totali_mensili(calcola_incentivi_mensili(emp, con_dettaglio=False)) != incentivi_dashboard(emp):
+            errori.append(f"caso casuale {n} (seed {seed}): differenze senza dettaglio\n{json.dumps(emp)}")
+    return errori
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Verifica di regressione del calcolo incentivi")
+    parser.add_argument("--casuali", type=int, default=500, help="numero di dipendenti casuali da confrontare")
+    parser.add_argument("--seed", type=int, default=0, help="seed del generatore casuale")
+    args = parser.parse_args(argv)
+
+    errori = verifica_casi_riferimento() + verifica_casuale(args.casuali, args.seed)
+    for errore in errori:
+        print(f"❌ {errore}")
+    if errori:
+        print(f"{len(errori)} differenze trovate.")
+        return 1
+    print(f"✅ Casi di riferimento e {args.casuali} casi casuali (seed {args.seed}) coerenti.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
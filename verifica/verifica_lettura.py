@@ -0,0 +1,135 @@
+"""
+Verifica della lettura a blocchi dell'archivio (dati.scorri_sezione).
+
+1) Casi fissi: documenti scelti per mettere i confini dei blocchi nei punti
+   difficili (numeri con parte decimale o esponente, stringhe con escape,
+   sezioni vuote o mancanti), letti con tutte le dimensioni di blocco da 1 a 16.
+2) Confronto casuale: genera documenti JSON casuali, li scrive con formattazioni
+   diverse e verifica che ogni sezione letta a blocchi sia identica a quella di
+   json.load, con dimensioni di blocco casuali.
+
+Uso (dalla cartella del progetto):
+    python -m verifica.verifica_lettura [--casuali 400] [--seed 0]
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+
+from dati import scorri_sezione
+
+BLOCCHI_FISSI = list(range(1, 17)) + [64, 1 << 16]
+
+CASI_FISSI = [
+    ("numero decimale come voce", '{"employees": {"1": 150.25}}', "employees"),
+    ("esponente negativo prima della sezione", '{"x": 1e-07, "employees": {"a": -0.5e+10, "b": 2E3}}', "employees"),
+    ("numero di primo livello dopo la sezione", '{"employees": {"1": {"kpis": {}}}, "versione": 12.5e-3}', "employees"),
+    ("valori letterali", '{"a": true, "employees": {"1": null, "2": false, "3": -0}}', "employees"),
+    ("stringhe con escape e parentesi", '{"employees": {"{\\"}": "a,b}c\\\\", "\\u00e8": ["]", "}"]}}', "employees"),
+    ("sezione vuota", '{"mesi_chiusi": {}, "employees": {"1": 1}}', "mesi_chiusi"),
+    ("sezione dopo una sezione vuota", '{"mesi_chiusi": {}, "employees": {"1": 1}}', "employees"),
+    ("sezione mancante", '{"employees": {"1": 1}, "altro": [1, 2.5, 3e2]}', "mesi_chiusi"),
+    ("documento vuoto", '{}', "employees"),
+    ("spazi e a capo", '{\r\n\t"employees" :\n {\n "1" : 7.000001 ,\n "2" : 8 \n }\n}\n', "employees")
+]
+
+
+def _scrivi(testo):
+    descrittore, percorso = tempfile.mkstemp(prefix="verifica_lettura_", suffix=".json")
+    with os.fdopen(descrittore, "w") as file:
+        file.write(testo)
+    return percorso
+
+
+def _confronta(testo, sezione, blocchi):
+    """
+    Restituisce la lista delle dimensioni di blocco per cui la lettura a blocchi
+    differisce da json.load, con il motivo.
+    """
+    atteso = list(json.loads(testo).get(sezione, {}).items())
+    percorso = _scrivi(testo)
+    differenze = []
+    try:
+        for blocco in blocchi:
+            try:
+                ottenuto = list(scorri_sezione(percorso, sezione, blocco))
+            except ValueError as errore:
+                differenze.append(f"blocco {blocco}: {errore}")
+                continue
+            if ottenuto != atteso:
+                differenze.append(f"blocco {blocco}: {ottenuto!r} invece di {atteso!r}")
+    finally:
+        os.remove(percorso)
+    return differenze
+
+
+def verifica_casi_fissi():
+    errori = []
+    for descrizione, testo, sezione in CASI_FISSI:
+        for differenza in _confronta(testo, sezione, BLOCCHI_FISSI):
+            errori.append(f"{descrizione}: {differenza}")
+    return errori
+
+
+def _valore_casuale(rng, profondita=0):
+    caso = rng.random()
+    if profondita < 3 and caso < 0.15:
+        return {f"k{rng.randint(0, 99)}": _valore_casuale(rng, profondita + 1) for _ in range(rng.randint(0, 4))}
+    if profondita < 3 and caso < 0.25:
+        return [_valore_casuale(rng, profondita + 1) for _ in range(rng.randint(0, 4))]
+    if caso < 0.45:
+        return rng.randint(-10**6, 10**6)
+    if caso < 0.75:
+        # Anche numeri molto piccoli o grandi, che json.dumps scrive con l'esponente
+        return rng.choice([rng.uniform(-1e3, 1e3), rng.random() * 10 ** rng.randint(-12, 22), rng.randint(0, 600) / 2])
+    if caso < 0.9:
+        return "".join(rng.choice('ab ,:{}[]"\\è\n') for _ in range(rng.randint(0, 8)))
+    return rng.choice([True, False, None])
+
+
+def genera_documento(rng):
+    """
+    Testo JSON con sezioni oggetto (tra cui quelle dell'archivio) e valori di primo livello.
+    """
+    documento = {}
+    for nome in rng.sample(["mesi_chiusi", "employees", "x", "versione", "altro"], rng.randint(1, 5)):
+        if nome in ("mesi_chiusi", "employees") or rng.random() < 0.5:
+            documento[nome] = {str(i): _valore_casuale(rng) for i in range(rng.randint(0, 6))}
+        else:
+            documento[nome] = _valore_casuale(rng)
+    formato = rng.choice([{}, {"indent": 4}, {"separators": (",", ":")}, {"indent": "\t", "ensure_ascii": False}])
+    return json.dumps(documento, **formato)
+
+
+def verifica_casuale(numero_casi, seed):
+    rng = random.Random(seed)
+    errori = []
+    for n in range(numero_casi):
+        testo = genera_documento(rng)
+        blocchi = [rng.randint(1, 12), rng.randint(13, 200)]
+        for sezione in ("employees", "mesi_chiusi"):
+            for differenza in _confronta(testo, sezione, blocchi):
+                errori.append(f"documento casuale {n} (seed {seed}), sezione {sezione}: {differenza}\n{testo}")
+    return errori
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Verifica della lettura a blocchi dell'archivio")
+    parser.add_argument("--casuali", type=int, default=400, help="numero di documenti casuali da confrontare")
+    parser.add_argument("--seed", type=int, default=0, help="seed del generatore casuale")
+    args = parser.parse_args(argv)
+
+    errori = verifica_casi_fissi() + verifica_casuale(args.casuali, args.seed)
+    for errore in errori:
+        print(f"❌ {errore}")
+    if errori:
+        print(f"{len(errori)} differenze trovate.")
+        return 1
+    print(f"✅ Casi fissi e {args.casuali} documenti casuali (seed {args.seed}) letti come con json.load.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())